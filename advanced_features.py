@@ -1,5 +1,11 @@
 import re
-from model import model_response
+import copy
+from model import model_response, model_responses
+from request_limits import check_input_size, iter_lines, MAX_CONVERSATION_CHARS
+from answer_analyzer import analyze_experience, record_analysis
+from output_processing import clean_cover_letter
+from checkpoints import new_session_id, save_checkpoint, load_checkpoint
+from basic_functions import build_action_prompt
 
 # =============================================================================
 # FUNCTION: extract_key_requirements
@@ -16,6 +22,10 @@ def extract_key_requirements(text):
     Returns:
         str: A structured list of categorized requirements or an error message.
     """
+    size_error = check_input_size(text)
+    if size_error:
+        return size_error
+
     prompt = f"""Extract and list the key skills, qualifications, and requirements
 from the following job posting in a clear and structured format:
 
@@ -30,7 +40,7 @@ Output format:
 - Other requirements: [list]
 """
     try:
-        response = model_response(prompt)
+        response = model_response(prompt, task="requirements")
         return response
     except Exception as e:
         return f"Error while extracting key requirements: {str(e)}"
@@ -38,41 +48,6 @@ Output format:
 
 
 
-# =============================================================================
-# FUNCTION: create_cover_letter
-# =============================================================================
-
-def extract_key_requirements(text):
-    """
-    Extracts and lists the key skills, qualifications, and requirements
-    from a job posting in a clear, structured format.
-
-    Args:
-        text (str): Full job posting text.
-
-    Returns:
-        str: A structured list of categorized requirements or an error message.
-    """
-    prompt = f"""Extract and list the key skills, qualifications, and requirements
-from the following job posting in a clear and structured format:
-
-{text}
-
-Output format:
-- Technical skills: [list]
-- Soft skills: [list]
-- Education: [list]
-- Required experience: [list]
-- Languages: [list]
-- Other requirements: [list]
-"""
-    try:
-        response = model_response(prompt)
-        return response
-    except Exception as e:
-        return f"Error while extracting key requirements: {str(e)}"
-
-
 # =============================================================================
 # FUNCTION: create_cover_letter
 # =============================================================================
@@ -92,11 +67,16 @@ def create_cover_letter(cv_text, job_text):
     if not cv_text.strip() or not job_text.strip():
         return "Error: Both your CV and the job description are required."
 
+    size_error = check_input_size(cv_text, job_text)
+    if size_error:
+        return size_error
+
     candidate_name = "The Candidate"  # Default fallback name
 
     try:
-        lines = cv_text.split('\n') if '\\n' not in cv_text else cv_text.split('\\n')
-        for line in lines:
+        # The name is expected near the top, so only the first lines are scanned
+        separator = '\n' if '\\n' not in cv_text else '\\n'
+        for line in iter_lines(cv_text, max_lines=50, sep=separator):
             line = line.strip()
             if line and '|' not in line and '@' not in line and ':' not in line and len(line.split()) < 5:
                 candidate_name = line
@@ -139,25 +119,8 @@ def create_cover_letter(cv_text, job_text):
 **GENERATED COVER LETTER BODY (IN ENGLISH, NO HEADERS/PLACEHOLDERS, USE '{candidate_name}' AT THE END):**
 """
     try:
-        response = model_response(prompt).strip()
-        lines = response.split('\n')
-
-        final_lines = []
-        in_body = False
-        for line in lines:
-            stripped = line.strip()
-            if stripped.lower().startswith(("dear", "to the attention")):
-                in_body = True
-            if in_body and not (stripped.startswith('[') and stripped.endswith(']')):
-                if stripped or final_lines:
-                    final_lines.append(line)
-
-        response_cleaned = '\n'.join(final_lines).strip()
-
-        if candidate_name != "The Candidate":
-            response_cleaned = response_cleaned.replace("[Your Name]", candidate_name)
-
-        return response_cleaned
+        response = model_response(prompt, task="cover_letter")
+        return clean_cover_letter(response, candidate_name if candidate_name != "The Candidate" else None)
 
     except Exception as e:
         return f"Error generating cover letter: {str(e)}"
@@ -185,6 +148,10 @@ def cv_agent(job_description, user_input="", context=None):
             - updated_context (dict): Updated context with stored information.
             - cv_ready (bool): Whether the CV is ready to be generated.
     """
+    size_error = check_input_size(job_description, user_input)
+    if size_error:
+        return size_error, context, False
+
     # Initialize context if it's the first interaction
     if not context:
         prompt = f"""Analyze the following job posting and extract:
@@ -203,17 +170,20 @@ Respond in this JSON format:
 }}
 """
         try:
-            job_analysis = model_response(prompt)
+            job_analysis = model_response(prompt, task="job_analysis")
 
             import re
             title_match = re.search(r'"title":\s*"([^"]+)"', job_analysis)
             title = title_match.group(1) if title_match else "target role"
+            skills_match = re.search(r'"skills":\s*\[([^\]]*)\]', job_analysis)
+            skills = re.findall(r'"([^"]+)"', skills_match.group(1)) if skills_match else []
 
             context = {
                 "state": "personal_info",
                 "data": {
                     "job_posting": {
                         "title": title,
+                        "skills": skills,
                         "description": job_description
                     },
                     "personal": {},
@@ -221,11 +191,14 @@ Respond in this JSON format:
                     "education": [],
                     "skills": []
                 },
-                "questions_asked": 0
+                "questions_asked": 0,
+                "session_id": new_session_id()
             }
+            save_checkpoint(context, "job_analysis", {"job_analysis": job_analysis})
 
             return (
                 f"Hi! I'm going to help you create a tailored CV for the '{title}' position. "
+                f"(Your session ID is {context['session_id']}, you can use it to resume this conversation later.) "
                 f"Let's start with some basic personal information. "
                 f"Can you provide your full name, email address, and phone number?",
                 context,
@@ -237,47 +210,35 @@ Respond in this JSON format:
     
     elif context["state"] == "personal_info":
         try:
-            # Extract full name
+            # Extract full name, email and phone number in a single dispatch
             prompt_name = f"""Read the following text and extract ONLY the person's full name:
 
 Text: "{user_input}"
 
 Respond ONLY with the full name. Do not include any other text or explanation.
 """
-            try:
-                name = model_response(prompt_name).strip()
-                context["data"]["personal"]["name"] = name
-            except Exception:
-                context["data"]["personal"]["name"] = "User"
-
-            # Extract email
             prompt_email = f"""Read the following text and extract ONLY the email address:
 
 Text: "{user_input}"
 
 Respond ONLY with the email address. Do not include any other text or explanation.
 """
-            try:
-                email = model_response(prompt_email).strip()
-                context["data"]["personal"]["email"] = email
-            except Exception:
-                context["data"]["personal"]["email"] = ""
-
-            # Extract phone number
             prompt_phone = f"""Read the following text and extract ONLY the phone number:
 
 Text: "{user_input}"
 
 Respond ONLY with the phone number. Do not include any other text or explanation.
 """
-            try:
-                phone = model_response(prompt_phone).strip()
-                context["data"]["personal"]["phone"] = phone
-            except Exception:
-                context["data"]["personal"]["phone"] = ""
+            name, email, phone = model_responses([prompt_name, prompt_email, prompt_phone], task="extraction")
+
+            # Fallback values for the extractions that failed
+            context["data"]["personal"]["name"] = "User" if isinstance(name, Exception) else name.strip()
+            context["data"]["personal"]["email"] = "" if isinstance(email, Exception) else email.strip()
+            context["data"]["personal"]["phone"] = "" if isinstance(phone, Exception) else phone.strip()
 
             if context["data"]["personal"].get("name") and context["data"]["personal"].get("email"):
                 context["state"] = "work_experience"
+                save_checkpoint(context, "personal_info", dict(context["data"]["personal"]))
                 return (
                     f"Thank you, {context['data']['personal'].get('name')}. "
                     f"Now, please tell me about your relevant work experience for the position of {context['data']['job_posting']['title']}. "
@@ -303,14 +264,35 @@ Respond ONLY with the phone number. Do not include any other text or explanation
                 False
             )
     
+    elif context["state"] in ("work_experience", "education", "skills") and (
+        collected_chars(context) + len(user_input) > MAX_CONVERSATION_CHARS
+    ):
+        return (
+            "Your answers are getting too long for a single CV. "
+            "Please summarize this part in a few sentences.",
+            context,
+            False
+        )
+
     elif context["state"] == "work_experience":
         try:
             # Save the raw experience text
             context["data"]["experience"].append(user_input)
             context["questions_asked"] += 1
 
-            # Analyze the experience to determine relevance and completeness
-            prompt = f"""Analyze this work experience description:
+            # Common cases are settled locally; the model is only asked when the rules are unsure
+            job_posting = context['data']['job_posting']
+            local_analysis = analyze_experience(user_input, job_posting['title'], job_posting.get('skills'))
+            record_analysis(local_analysis["confident"])
+
+            try:
+                if local_analysis["confident"]:
+                    is_complete = local_analysis["is_complete"]
+                    is_relevant = local_analysis["is_relevant"]
+                    needs_more_details = local_analysis["needs_more_details"]
+                else:
+                    # Analyze the experience to determine relevance and completeness
+                    prompt = f"""Analyze this work experience description:
 {user_input}
 
 Identify:
@@ -326,17 +308,15 @@ Respond in the following JSON format:
     "needs_more_details": true/false
 }}
 """
-            try:
-                analysis = model_response(prompt)
+                    analysis = model_response(prompt, task="classification")
 
-                import re
-                complete_match = re.search(r'"is_complete":\s*(true|false)', analysis, re.IGNORECASE)
-                relevant_match = re.search(r'"is_relevant":\s*(true|false)', analysis, re.IGNORECASE)
-                detail_match = re.search(r'"needs_more_details":\s*(true|false)', analysis, re.IGNORECASE)
+                    complete_match = re.search(r'"is_complete":\s*(true|false)', analysis, re.IGNORECASE)
+                    relevant_match = re.search(r'"is_relevant":\s*(true|false)', analysis, re.IGNORECASE)
+                    detail_match = re.search(r'"needs_more_details":\s*(true|false)', analysis, re.IGNORECASE)
 
-                is_complete = complete_match.group(1).lower() == "true" if complete_match else True
-                is_relevant = relevant_match.group(1).lower() == "true" if relevant_match else True
-                needs_more_details = detail_match.group(1).lower() == "true" if detail_match else False
+                    is_complete = complete_match.group(1).lower() == "true" if complete_match else True
+                    is_relevant = relevant_match.group(1).lower() == "true" if relevant_match else True
+                    needs_more_details = detail_match.group(1).lower() == "true" if detail_match else False
 
             except Exception:
                 # Fallback values if analysis fails
@@ -344,7 +324,15 @@ Respond in the following JSON format:
                 is_relevant = True
                 needs_more_details = False
 
+            analysis_outputs = {
+                "is_complete": is_complete,
+                "is_relevant": is_relevant,
+                "needs_more_details": needs_more_details,
+            }
+
             if needs_more_details and context["questions_asked"] < 4:
+                # The answer is kept even though the stage is not complete yet
+                save_checkpoint(context, "work_experience", analysis_outputs)
                 return (
                     "Thanks for sharing. Could you please provide more details about that role? "
                     "For example, what kind of projects did you work on, or what impact did you have?",
@@ -354,6 +342,7 @@ Respond in the following JSON format:
             else:
                 # Proceed to next phase
                 context["state"] = "education"
+                save_checkpoint(context, "work_experience", analysis_outputs)
                 return (
                     "Great. Now, could you tell me about your educational background? "
                     "Include degrees, institutions, and graduation years.",
@@ -366,6 +355,7 @@ Respond in the following JSON format:
                 context["data"]["experience"].append(user_input)
                 context["questions_asked"] += 1
                 context["state"] = "education"
+                save_checkpoint(context, "work_experience")
                 return (
                     "Thanks for sharing your experience. Now, please tell me about your education — "
                     "degrees, institutions, and graduation years.",
@@ -386,6 +376,7 @@ Respond in the following JSON format:
 
         # Proceed to the next phase: skills
         context["state"] = "skills"
+        save_checkpoint(context, "education")
         return (
             f"Perfect. Lastly, what technical and soft skills do you believe make you "
             f"a strong candidate for the position of {context['data']['job_posting']['title']}?",
@@ -399,6 +390,7 @@ Respond in the following JSON format:
 
         # Mark as completed
         context["state"] = "finalized"
+        save_checkpoint(context, "skills")
         return (
             f"Great! I have collected all the necessary information to generate your tailored CV "
             f"for the position of {context['data']['job_posting']['title']}. Now I will generate a professional CV "
@@ -417,6 +409,129 @@ Respond in the following JSON format:
 
 
 
+# =============================================================================
+# FUNCTION: resume_cv_agent
+# =============================================================================
+
+# Question to ask when a conversation is resumed in a given state
+RESUME_QUESTIONS = {
+    "personal_info": "Can you provide your full name, email address, and phone number?",
+    "work_experience": "Please tell me about your relevant work experience. "
+                       "Include the company name, your role, dates, and a brief description of your responsibilities.",
+    "education": "Could you tell me about your educational background? "
+                 "Include degrees, institutions, and graduation years.",
+    "skills": "What technical and soft skills do you believe make you a strong candidate for this position?",
+}
+
+# Editable stage -> section of context["data"] it fills
+STAGE_SECTIONS = {
+    "personal_info": "personal",
+    "work_experience": "experience",
+    "education": "education",
+    "skills": "skills",
+}
+
+def resume_cv_agent(session_id):
+    """
+    Restores a cv_agent conversation from its last checkpoint.
+
+    Args:
+        session_id (str): The session id given at the start of the conversation.
+
+    Returns:
+        tuple: (next_user_message, context, cv_ready), as returned by cv_agent.
+    """
+    if not session_id or not session_id.strip():
+        return "Please provide the session ID you want to resume.", None, False
+
+    checkpoint = load_checkpoint(session_id)
+    if not checkpoint:
+        return f"No saved conversation was found for session ID '{session_id.strip()}'.", None, False
+
+    context = checkpoint[0]
+    title = context["data"]["job_posting"]["title"]
+    if context["state"] == "finalized":
+        return f"Welcome back! All the information for the '{title}' position is already collected.", context, True
+
+    return (
+        f"Welcome back! We were working on your CV for the '{title}' position. "
+        f"{RESUME_QUESTIONS.get(context['state'], '')}",
+        context,
+        False
+    )
+
+
+# =============================================================================
+# FUNCTION: edit_cv_agent_answer
+# =============================================================================
+
+def edit_cv_agent_answer(job_description, new_answer, context, stage):
+    """
+    Replaces the answer given for one stage of a finished conversation and re-runs
+    only that stage. The data and model outputs of the other stages are reused.
+
+    Args:
+        job_description (str): The job posting text.
+        new_answer (str): The new answer for the stage.
+        context (dict | None): A finalized cv_agent context.
+        stage (str): One of "personal_info", "work_experience", "education", "skills".
+
+    Returns:
+        tuple: (next_user_message, updated_context, cv_ready). If the new answer
+        cannot be used, the original context is returned unchanged.
+    """
+    if not context or context.get("state") != "finalized":
+        return "You can edit an answer once all the questions have been answered.", context, False
+    if stage not in STAGE_SECTIONS:
+        return "Please choose the answer you want to edit.", context, False
+    if not new_answer or not new_answer.strip():
+        return "Please type the new answer in the response box.", context, False
+
+    edited = copy.deepcopy(context)
+    # The CV of the previous answers must be generated again
+    edited.pop("cv_text", None)
+    edited.pop("improved_cv", None)
+    # Without a session id the re-run stage does not checkpoint the half-edited context
+    session_id = edited.pop("session_id", None)
+    section = STAGE_SECTIONS[stage]
+    edited["data"][section] = {} if section == "personal" else []
+    edited["state"] = stage
+    if stage == "work_experience":
+        # The edited answer is accepted as is, without asking for more details
+        edited["questions_asked"] = 4
+
+    message, edited, _ = cv_agent(job_description, new_answer, edited)
+    if not edited or edited["state"] == stage:
+        return f"The answer could not be updated. {message}", context, False
+
+    edited["state"] = "finalized"
+    edited["session_id"] = session_id
+    save_checkpoint(edited, stage)
+    return "Your answer has been updated. Regenerating your CV...", edited, True
+
+
+
+
+# =============================================================================
+# HELPER FUNCTION: collected_chars
+# =============================================================================
+
+def collected_chars(context):
+    """
+    Counts the characters of all the answers collected so far by the cv_agent.
+
+    Args:
+        context (dict): Conversation context.
+
+    Returns:
+        int: Total length of the stored experience, education and skills answers.
+    """
+    data = context["data"]
+    return sum(len(answer) for section in ("experience", "education", "skills") for answer in data[section])
+
+
+
+
 # =============================================================================
 # FUNCTION: generate_cv_from_agent_data
 # =============================================================================
@@ -424,7 +539,8 @@ Respond in the following JSON format:
 def generate_cv_from_agent_data(context):
     """
     Generates a formatted CV text (in Markdown) from the conversation context
-    gathered by the cv_agent.
+    gathered by the cv_agent. The CV is stored in the context, so it is generated
+    only once per version of the answers.
 
     Args:
         context (dict): Conversation context with all collected user data.
@@ -434,11 +550,18 @@ def generate_cv_from_agent_data(context):
     """
     if not context or "data" not in context:
         return "Error: Not enough data to generate the CV."
+    if context.get("cv_text"):
+        return context["cv_text"]
 
     data = context["data"]
-    print(f'EXPERIENCE: \n{" ".join(data["experience"])}')
-    print(f'EDUCATION: \n{"" "".join(data["education"])}')
-    print(f'SKILLS: \n{"" "".join(data["skills"])}')
+
+    # Each section is joined only once and reused for logging and for the prompt
+    experience = ' '.join(data["experience"])
+    education = ' '.join(data["education"])
+    skills = ' '.join(data["skills"])
+    print(f'EXPERIENCE: \n{experience}')
+    print(f'EDUCATION: \n{education}')
+    print(f'SKILLS: \n{skills}')
 
     # Extract personal information
     name = data["personal"].get("name", "")
@@ -454,13 +577,13 @@ def generate_cv_from_agent_data(context):
 - Phone: {phone}
 
 **WORK EXPERIENCE:**
-{' '.join(data["experience"])}
+{experience}
 
 **EDUCATION:**
-{' '.join(data["education"])}
+{education}
 
 **SKILLS:**
-{' '.join(data["skills"])}
+{skills}
 
 **INSTRUCTIONS:**
 1. Create a well-structured, professional CV tailored to the job posting.
@@ -475,7 +598,41 @@ Generate ONLY the CV text, without any extra explanations or comments.
 """
 
     try:
-        cv_text = model_response(prompt)
+        cv_text = model_response(prompt, task="cv_generation")
+        context["cv_text"] = cv_text
         return cv_text
     except Exception as e:
         return f"Error generating CV: {str(e)}"
+
+
+
+
+# =============================================================================
+# FUNCTION: improve_agent_cv
+# =============================================================================
+
+def improve_agent_cv(context):
+    """
+    Generates the CV of a finished conversation and rewrites it to be more impactful.
+    Both texts are stored in the context and checkpointed, so resuming the session
+    or regenerating the PDF does not call the model again until an answer is edited.
+
+    Args:
+        context (dict): A finalized cv_agent context.
+
+    Returns:
+        tuple[str | None, str | None, str | None]: (error, cv_text, improved_cv). The
+        error is None when both texts are available.
+    """
+    cv_text = generate_cv_from_agent_data(context)
+    if not context or "cv_text" not in context:
+        return cv_text, None, None
+
+    if not context.get("improved_cv"):
+        try:
+            context["improved_cv"] = model_response(build_action_prompt(cv_text, "improve_cv"), task="improve_cv")
+        except Exception as e:
+            return f"Error improving CV: {str(e)}", cv_text, None
+        save_checkpoint(context, "cv_generation", {"cv_text": cv_text, "improved_cv": context["improved_cv"]})
+
+    return None, cv_text, context["improved_cv"]
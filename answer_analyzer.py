@@ -0,0 +1,150 @@
+import re
+import threading
+from datetime import date
+
+# =============================================================================
+# LOCAL ANSWER ANALYZER
+# =============================================================================
+# Rule-based analysis of the work experience answers given to the cv_agent. It
+# settles the common cases (clearly complete or clearly too short answers) on the
+# CPU, and leaves the ambiguous ones to the model.
+
+MONTHS = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?'
+# A year that is not part of a longer run of digit groups, such as a phone number
+YEAR = r'(?<![\d+])(?<!\d[ .])(?:19|20)\d{2}(?![ .]?\d)'
+PRESENT = r'(?:present|now|today|current|currently|actualidad|hoy)'
+
+DATE_RANGE_RE = re.compile(
+    rf'(?:{MONTHS}\s+)?({YEAR})\s*(?:-|–|—|to|until|till|hasta|a)\s*(?:(?:{MONTHS}\s+)?({YEAR})|{PRESENT})',
+    re.IGNORECASE,
+)
+DURATION_RE = re.compile(r'(\d+(?:[.,]\d+)?)\s*\+?\s*(years?|yrs?|años?|months?|meses?)', re.IGNORECASE)
+YEAR_RE = re.compile(rf'\b{YEAR}\b')
+
+ROLE_RE = re.compile(
+    r'\b(developer|engineer|manager|analyst|consultant|designer|architect|administrator|'
+    r'technician|assistant|intern|specialist|coordinator|scientist|lead|director|'
+    r'programmer|teacher|nurse|accountant|sales|operator|desarrollador|ingeniero|analista)\b',
+    re.IGNORECASE,
+)
+COMPANY_RE = re.compile(
+    r'(\b(?:at|for|en|with)\s+[A-Z][\w&.-]*|\b[\w&-]+\s+(?:Inc|Corp|Corporation|Ltd|LLC|GmbH|S\.?L\.?|S\.?A\.?)\b)'
+)
+# Words keep inner dots ("node.js") but not the one ending a sentence
+WORD_RE = re.compile(r'[a-záéíóúñ0-9+#]+(?:\.[a-záéíóúñ0-9+#]+)*', re.IGNORECASE)
+
+# Answers with at least this many words, a date and a role or company are considered complete
+COMPLETE_MIN_WORDS = 25
+# Answers with fewer words and no date are clearly missing details
+SHORT_MAX_WORDS = 8
+
+_stats_lock = threading.Lock()
+_stats = {"fast_path": 0, "model": 0}
+
+
+# =============================================================================
+# FUNCTION: analyze_experience
+# =============================================================================
+def analyze_experience(text, job_title="", skills=None):
+    """
+    Analyzes a work experience answer without calling the model.
+
+    Args:
+        text (str): The user's answer.
+        job_title (str): Title of the target position.
+        skills (list[str] | None): Key skills extracted from the job posting.
+
+    Returns:
+        dict: The keys expected from the model analysis ("is_complete", "is_relevant",
+        "needs_more_details", "total_experience_years"), plus "confident", which tells
+        whether the result can be used without asking the model.
+    """
+    words = WORD_RE.findall(text.lower())
+    years = experience_years(text)
+    has_dates = years is not None or bool(YEAR_RE.search(text))
+    has_role = bool(ROLE_RE.search(text))
+    has_company = bool(COMPANY_RE.search(text))
+
+    # Relevance: overlap between the answer and the posting's title and skills
+    targets = set(WORD_RE.findall(job_title.lower()))
+    for skill in skills or []:
+        targets.update(WORD_RE.findall(skill.lower()))
+    targets = {word for word in targets if len(word) > 2}
+    is_relevant = bool(targets & set(words)) if targets else True
+
+    if len(words) >= COMPLETE_MIN_WORDS and has_dates and (has_role or has_company):
+        is_complete, needs_more_details, confident = True, False, True
+    elif len(words) < SHORT_MAX_WORDS and not has_dates:
+        is_complete, needs_more_details, confident = False, True, True
+    else:
+        is_complete, needs_more_details, confident = has_dates, not has_dates, False
+
+    return {
+        "is_complete": is_complete,
+        "is_relevant": is_relevant,
+        "needs_more_details": needs_more_details,
+        "total_experience_years": years or 0,
+        "confident": confident,
+    }
+
+
+# =============================================================================
+# HELPER FUNCTION: experience_years
+# =============================================================================
+def experience_years(text):
+    """
+    Estimates the years of experience described in a text from its date ranges or durations.
+
+    Args:
+        text (str): The text to scan.
+
+    Returns:
+        float | None: The total years found, or None if the text has no dates or durations.
+    """
+    total = 0.0
+    found = False
+    current_year = date.today().year
+
+    for match in DATE_RANGE_RE.finditer(text):
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else current_year
+        if end >= start:
+            total += end - start
+            found = True
+
+    if not found:
+        for amount, unit in DURATION_RE.findall(text):
+            value = float(amount.replace(',', '.'))
+            total += value / 12 if unit.lower().startswith(('month', 'mes')) else value
+            found = True
+
+    return round(total, 1) if found else None
+
+
+# =============================================================================
+# METRICS
+# =============================================================================
+def record_analysis(fast_path):
+    """
+    Counts an analysis as resolved locally (fast_path=True) or by the model.
+    """
+    with _stats_lock:
+        _stats["fast_path" if fast_path else "model"] += 1
+
+
+def analyzer_stats():
+    """
+    Returns the fast path counters of this process, for the statistics panel.
+
+    Returns:
+        dict: The hit rate and the number of analyses resolved locally, by the model and in total.
+    """
+    with _stats_lock:
+        fast_path, model = _stats["fast_path"], _stats["model"]
+    total = fast_path + model
+    return {
+        "fast_path_hit_rate": round(fast_path / total, 3) if total else 0.0,
+        "fast_path": fast_path,
+        "model": model,
+        "total": total,
+    }
@@ -1,27 +1,56 @@
 import os
-import markdown
+import time
+import tempfile
 from model import model_response
-from playwright.sync_api import sync_playwright
-from jinja2 import Environment, FileSystemLoader
+from document_pipeline import convert_markdown_to_html, html_to_pdf_playwright, render_pool
+from request_limits import check_input_size, iter_lines
+
+# Directory where generated PDFs are written before Gradio copies them to its own cache.
+# Every file gets a unique name so that concurrent requests never overwrite each other.
+ARTIFACT_DIR = os.getenv('ARTIFACT_DIR', os.path.join(tempfile.gettempdir(), "cv_artifacts"))
+
+# Seconds a generated PDF is kept; CVs hold personal data, so they are not kept for long
+ARTIFACT_MAX_AGE = float(os.getenv('ARTIFACT_MAX_AGE', '600'))
+
 
 # =============================================================================
-# MAIN FUNCTION: action_manager
+# HELPER FUNCTION: purge_old_artifacts
 # =============================================================================
-def action_manager(text, action_type):
+def purge_old_artifacts(max_age=ARTIFACT_MAX_AGE):
     """
-    Manages text processing actions such as simplification, summarization, or CV improvement.
+    Deletes the generated PDFs older than max_age seconds.
+
+    Parameters:
+        max_age (float): Maximum age of a generated PDF, in seconds.
+    """
+    if not os.path.isdir(ARTIFACT_DIR):
+        return
+    cutoff = time.time() - max_age
+    for entry in os.scandir(ARTIFACT_DIR):
+        if not entry.name.startswith("generated_cv_"):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            # Another worker may have removed it already
+            pass
+
+
+# =============================================================================
+# HELPER FUNCTION: build_action_prompt
+# =============================================================================
+def build_action_prompt(text, action_type):
+    """
+    Builds the model prompt of a text processing action.
 
     Parameters:
         text (str): The text to be processed.
-        action_type (str): The type of action to perform ('simplify', 'summarize', 'improve_cv').
+        action_type (str): The type of action to perform ('summarize', 'improve_cv').
 
     Returns:
-        Tuple[str | None, str | None]: The processed text or the path to the generated PDF file,
-        depending on the action type.
+        str | None: The prompt, or None if the action type is unknown.
     """
-    if not text.strip():
-        return None, None 
-    
     prompts = {
       
         "summarize": f"""**TASK:** Create a very concise summary (2-3 sentences or a list of 3-5 key points) of the following text.
@@ -48,85 +77,82 @@ def action_manager(text, action_type):
                       **REWRITTEN CV SECTION:**"""
     }
     
-    prompt = prompts.get(action_type)
-    if not prompt:
-        return "Invalid action type.", None 
-
-    try:
-        response = model_response(prompt)
-
-        if action_type == "improve_cv":
-            try:
-                cv_name = text.split('\n')[0].strip() if text else "Improved CV"
-                cv_header = f'<div class="cv-header"><h1 class="name">{cv_name}</h1></div>'
-                processed_html = convert_markdown_to_html(response)
-                cv_content_html = f'{cv_header}<div class="cv-content">{processed_html}</div>'
-
-                env = Environment(loader=FileSystemLoader('.'))
-                template = env.get_template('template.html')
-                html_content = template.render(cv_content=cv_content_html)
-
-                pdf_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated_cv.pdf")
-                html_to_pdf_playwright(html_content, pdf_path)
-
-                if os.path.exists(pdf_path):
-                    return None, pdf_path
-                else:
-                    return "Error: PDF file was not generated successfully.", None
-
-            except Exception as pdf_e:
-                import traceback
-                traceback.print_exc()
-                return f"Error generating PDF: {type(pdf_e).__name__}: {pdf_e}", None
-        else:
-            return response, None
-
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return f"Error processing text: {type(e).__name__}: {e}", None
-
+    return prompts.get(action_type)
 
 
 # =============================================================================
-# HELPER FUNCTION: convert_markdown_to_html
+# HELPER FUNCTION: render_improved_cv
 # =============================================================================
-def convert_markdown_to_html(markdown_text):
+def render_improved_cv(text, improved_text, session_key=None):
     """
-    Converts Markdown-formatted text to HTML.
+    Renders an improved CV to a PDF file in ARTIFACT_DIR.
 
     Parameters:
-        markdown_text (str): The input text in Markdown format.
+        text (str): The original CV text; its first line is used as the CV name.
+        improved_text (str): The improved CV in Markdown format.
+        session_key (str | None): User session; its warm PDF page is reused.
 
     Returns:
-        str: The HTML-converted text.
+        Tuple[str | None, str | None]: An error message, or the path to the generated PDF file.
     """
-    return markdown.markdown(markdown_text, extensions=['extra', 'nl2br'])
+    try:
+        cv_name = next(iter_lines(text, max_lines=1)).strip() if text else "Improved CV"
+
+        # Rendering runs in the document process pool, not in this request thread
+        pdf_bytes = render_pool.render(cv_name, improved_text, session_key=session_key)
+        if not pdf_bytes:
+            return "Error: PDF file was not generated successfully.", None
 
+        purge_old_artifacts()
+        os.makedirs(ARTIFACT_DIR, exist_ok=True)
+        fd, pdf_path = tempfile.mkstemp(prefix="generated_cv_", suffix=".pdf", dir=ARTIFACT_DIR)
+        with os.fdopen(fd, "wb") as pdf_file:
+            pdf_file.write(pdf_bytes)
+
+        return None, pdf_path
+
+    except Exception as pdf_e:
+        import traceback
+        traceback.print_exc()
+        return f"Error generating PDF: {type(pdf_e).__name__}: {pdf_e}", None
 
 
 # =============================================================================
-# HELPER FUNCTION: html_to_pdf_playwright
+# MAIN FUNCTION: action_manager
 # =============================================================================
-def html_to_pdf_playwright(html_content: str, pdf_path: str):
+def action_manager(text, action_type, session_key=None):
     """
-    Generates a PDF file from HTML content using Playwright.
+    Manages text processing actions such as simplification, summarization, or CV improvement.
 
     Parameters:
-        html_content (str): HTML content to render.
-        pdf_path (str): Path where the generated PDF will be saved.
+        text (str): The text to be processed.
+        action_type (str): The type of action to perform ('simplify', 'summarize', 'improve_cv').
+        session_key (str | None): User session; its warm PDF page is reused when regenerating a CV.
+
+    Returns:
+        Tuple[str | None, str | None]: The processed text or the path to the generated PDF file,
+        depending on the action type.
     """
-    with open(file='tmp.html', mode="w", encoding="utf-8") as tmp_html:
-        tmp_html.write(html_content)
-        tmp_html_path = tmp_html.name
+    if not text.strip():
+        return None, None 
 
-    file_url = f"file://{os.path.abspath(tmp_html_path)}"
+    size_error = check_input_size(text)
+    if size_error:
+        return size_error, None
+    
+    prompt = build_action_prompt(text, action_type)
+    if not prompt:
+        return "Invalid action type.", None 
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch()
-        page = browser.new_page()
-        page.goto(file_url)
-        page.pdf(path=pdf_path, format="A4")
-        browser.close()
+    try:
+        response = model_response(prompt, task=action_type)
 
-    os.remove(tmp_html_path)
+        if action_type == "improve_cv":
+            return render_improved_cv(text, response, session_key)
+        else:
+            return response, None
+
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return f"Error processing text: {type(e).__name__}: {e}", None
@@ -0,0 +1,56 @@
+import time
+import statistics
+import argparse
+from document_pipeline import render_cv_pdf
+from stub_model import STUB_CV
+
+# =============================================================================
+# BENCHMARK: edit-and-regenerate PDF latency
+# =============================================================================
+# Compares a full cold render (new browser, navigation, CSS and fonts) with a warm
+# re-render that only patches the CV content of a session's persistent page.
+#
+# Usage:
+#     python bench_pdf_render.py --runs 10
+
+
+def edited_cv(run):
+    """
+    Returns the sample CV with one bullet changed, as after a small user edit.
+    """
+    return STUB_CV.replace("Mentored a team of four junior developers.",
+                           f"Mentored a team of {run + 2} junior developers.")
+
+
+def time_renders(runs, session_key=None):
+    """
+    Renders the edited CV several times and returns the latency of each render in seconds.
+    """
+    latencies = []
+    for run in range(runs):
+        start = time.perf_counter()
+        render_cv_pdf("Jane Doe", edited_cv(run), session_key=session_key)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(label, latencies):
+    print(f"{label:<28}median {statistics.median(latencies) * 1000:8.1f} ms   "
+          f"min {min(latencies) * 1000:8.1f} ms   max {max(latencies) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark cold vs warm CV PDF rendering.")
+    parser.add_argument("--runs", type=int, default=10, help="Renders per mode.")
+    args = parser.parse_args()
+
+    cold = time_renders(args.runs)
+
+    # The first warm render opens the page; the following ones are edit-and-regenerate
+    first_warm = time_renders(1, session_key="benchmark")
+    warm = time_renders(args.runs, session_key="benchmark")
+
+    report("Cold render", cold)
+    report("Warm page, first render", first_warm)
+    report("Warm page, after an edit", warm)
+    print(f"Speedup after an edit: {statistics.median(cold) / statistics.median(warm):.1f}x")
@@ -0,0 +1,116 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+
+# =============================================================================
+# SHARED RESPONSE CACHE
+# =============================================================================
+# Model responses are stored in a SQLite file so that every app worker started
+# by serve.py reuses the answers of the others. The cache is disabled unless
+# RESPONSE_CACHE_DB points to a database file. Only the tasks listed in
+# RESPONSE_CACHE_TASKS are cached: by default the job offer analyses, whose
+# prompts hold no personal data and are answered at a low temperature. Entries
+# expire after RESPONSE_CACHE_TTL seconds.
+
+CACHE_TASKS = {
+    task.strip() for task in os.getenv('RESPONSE_CACHE_TASKS', 'job_analysis,requirements').split(',') if task.strip()
+}
+CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', '3600'))
+
+_local = threading.local()
+
+
+def _connection():
+    """
+    Returns the SQLite connection of the current thread, or None if the cache is disabled.
+    """
+    db_path = os.getenv('RESPONSE_CACHE_DB')
+    if not db_path:
+        return None
+
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "path", None) != db_path:
+        conn = sqlite3.connect(db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS response_cache_created_at ON response_cache (created_at)")
+        conn.commit()
+        _local.conn = conn
+        _local.path = db_path
+    return conn
+
+
+def is_cacheable(task):
+    """
+    Tells whether the responses of a task may be stored in the cache.
+
+    Args:
+        task (str | None): Task name (see model_router.TASK_TIERS).
+
+    Returns:
+        bool: Whether the task is in RESPONSE_CACHE_TASKS.
+    """
+    return task in CACHE_TASKS
+
+
+def cache_key(model_id, prompt):
+    """
+    Builds the cache key for a prompt sent to a given model.
+
+    Args:
+        model_id (str): Identifier of the model that answers the prompt.
+        prompt (str): The prompt text.
+
+    Returns:
+        str: A hex digest identifying the (model, prompt) pair.
+    """
+    return hashlib.sha256(f"{model_id}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+def cache_get(key):
+    """
+    Looks up a cached response.
+
+    Args:
+        key (str): Key built with cache_key.
+
+    Returns:
+        str | None: The cached response, or None on a miss, an expired entry or if the cache is disabled.
+    """
+    conn = _connection()
+    if conn is None:
+        return None
+    try:
+        row = conn.execute(
+            "SELECT response FROM response_cache WHERE key = ? AND created_at >= ?",
+            (key, time.time() - CACHE_TTL),
+        ).fetchone()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
+
+
+def cache_set(key, response):
+    """
+    Stores a response in the cache and drops the expired entries. Errors are ignored
+    so that caching never breaks a request.
+
+    Args:
+        key (str): Key built with cache_key.
+        response (str): The model response to store.
+    """
+    conn = _connection()
+    if conn is None or not isinstance(response, str):
+        return
+    try:
+        now = time.time()
+        conn.execute("INSERT OR REPLACE INTO response_cache VALUES (?, ?, ?)", (key, response, now))
+        conn.execute("DELETE FROM response_cache WHERE created_at < ?", (now - CACHE_TTL,))
+        conn.commit()
+    except sqlite3.Error:
+        pass
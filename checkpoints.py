@@ -0,0 +1,161 @@
+import os
+import json
+import zlib
+import time
+import uuid
+import sqlite3
+import threading
+
+# =============================================================================
+# CONVERSATION CHECKPOINTS
+# =============================================================================
+# Every completed cv_agent stage is stored in SQLite, together with the model
+# outputs it produced, so a conversation can be resumed by its session id after a
+# worker restart without paying again for the model calls already made. Only the
+# latest checkpoint of each stage is kept, as compressed JSON. The first stage
+# stores the whole context (with the job posting); the others only store what
+# they change: the data section they fill and the top-level fields such as the
+# state. Loading a session merges its checkpoints in the order they were saved.
+# Sessions untouched for CHECKPOINT_MAX_AGE seconds (a week by default) are deleted.
+
+CHECKPOINT_DB = os.getenv(
+    'CHECKPOINT_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), "checkpoints.sqlite3")
+)
+
+CHECKPOINT_MAX_AGE = float(os.getenv('CHECKPOINT_MAX_AGE', str(7 * 24 * 3600)))
+
+# Conversation stages, in order; "cv_generation" holds the generated CV texts
+STAGES = ["job_analysis", "personal_info", "work_experience", "education", "skills", "cv_generation"]
+
+# Stage -> section of context["data"] it fills
+STAGE_DATA = {
+    "personal_info": "personal",
+    "work_experience": "experience",
+    "education": "education",
+    "skills": "skills",
+}
+
+_local = threading.local()
+
+
+def _connection():
+    """
+    Returns the SQLite connection of the current thread.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(CHECKPOINT_DB, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "session_id TEXT NOT NULL, stage TEXT NOT NULL, "
+            "context BLOB NOT NULL, outputs TEXT NOT NULL, created_at REAL NOT NULL, "
+            "PRIMARY KEY (session_id, stage))"
+        )
+        conn.commit()
+        _local.conn = conn
+    return conn
+
+
+def new_session_id():
+    """
+    Returns a new short session id to show to the user.
+    """
+    return uuid.uuid4().hex[:12]
+
+
+# =============================================================================
+# FUNCTION: save_checkpoint
+# =============================================================================
+def save_checkpoint(context, stage, outputs=None):
+    """
+    Stores what a stage changed in the context. Any later stage invalidates the
+    generated CV. Old sessions are purged when a new conversation starts. Errors
+    are ignored so that checkpointing never breaks the conversation.
+
+    Args:
+        context (dict): The cv_agent context, which must hold a "session_id".
+        stage (str): The completed stage, one of STAGES.
+        outputs (dict | None): Model outputs produced by the stage.
+    """
+    session_id = context.get("session_id") if context else None
+    if not session_id:
+        return
+    if stage == STAGES[0]:
+        delta = context
+    else:
+        delta = {key: value for key, value in context.items() if key not in ("data", "session_id")}
+        if stage in STAGE_DATA:
+            delta["data"] = {STAGE_DATA[stage]: context["data"][STAGE_DATA[stage]]}
+
+    blob = zlib.compress(json.dumps(delta, separators=(",", ":")).encode("utf-8"))
+    try:
+        conn = _connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?)",
+            (session_id, stage, blob, json.dumps(outputs or {}), time.time()),
+        )
+        if stage != "cv_generation":
+            conn.execute("DELETE FROM checkpoints WHERE session_id = ? AND stage = 'cv_generation'", (session_id,))
+        conn.commit()
+        if stage == STAGES[0]:
+            purge_checkpoints()
+    except sqlite3.Error:
+        pass
+
+
+# =============================================================================
+# FUNCTION: purge_checkpoints
+# =============================================================================
+def purge_checkpoints(max_age=CHECKPOINT_MAX_AGE):
+    """
+    Deletes the sessions whose latest checkpoint is older than max_age seconds.
+
+    Args:
+        max_age (float): Maximum age of a session, in seconds.
+    """
+    conn = _connection()
+    conn.execute(
+        "DELETE FROM checkpoints WHERE session_id IN ("
+        "SELECT session_id FROM checkpoints GROUP BY session_id HAVING MAX(created_at) < ?)",
+        (time.time() - max_age,),
+    )
+    conn.commit()
+
+
+# =============================================================================
+# FUNCTION: load_checkpoint
+# =============================================================================
+def load_checkpoint(session_id, stage=None):
+    """
+    Rebuilds the context of a session from its checkpoints.
+
+    Args:
+        session_id (str): The session id.
+        stage (str | None): Last stage to include; every stage if None. After an
+            answer is edited, the edited stage is the most recent checkpoint, and
+            its state is the one restored.
+
+    Returns:
+        tuple[dict, str, dict] | None: The context, the most recently completed stage
+        and its model outputs, or None if the session has no first-stage checkpoint.
+    """
+    stages = STAGES[:STAGES.index(stage) + 1] if stage in STAGES else STAGES
+    try:
+        rows = _connection().execute(
+            "SELECT context, stage, outputs FROM checkpoints WHERE session_id = ? ORDER BY created_at",
+            (session_id.strip(),),
+        ).fetchall()
+    except sqlite3.Error:
+        return None
+
+    rows = [row for row in rows if row[1] in stages]
+    if not rows or rows[0][1] != STAGES[0]:
+        return None
+
+    context = json.loads(zlib.decompress(rows[0][0]))
+    for blob, _, _ in rows[1:]:
+        delta = json.loads(zlib.decompress(blob))
+        context["data"].update(delta.pop("data", {}))
+        context.update(delta)
+    return context, rows[-1][1], json.loads(rows[-1][2])
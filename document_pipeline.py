@@ -0,0 +1,352 @@
+import os
+import atexit
+import hashlib
+import tempfile
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from playwright.sync_api import sync_playwright
+from jinja2 import Environment, FileSystemLoader
+from output_processing import markdown_to_html, cv_markdown_to_html
+
+# =============================================================================
+# DOCUMENT PIPELINE
+# =============================================================================
+# Markdown -> HTML -> PDF rendering runs in a dedicated process pool so that the
+# Gradio request threads serving model calls are never blocked by Jinja or
+# Chromium. This module must not import the model, as every pool worker imports it.
+# The workers are not forked from the app process, which already runs Gradio,
+# SQLite and HTTP client threads (forking it could copy a lock held by one of them).
+# They are forked from a single-threaded fork server that has only imported this
+# module. Each of them still imports the main module, so app.py stays import-free.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Number of rendering processes, jobs allowed to wait for one, and seconds a job may take
+RENDER_WORKERS = int(os.getenv('RENDER_WORKERS', '2'))
+RENDER_QUEUE_DEPTH = int(os.getenv('RENDER_QUEUE_DEPTH', '8'))
+RENDER_TIMEOUT = float(os.getenv('RENDER_TIMEOUT', '60'))
+
+# Warm pages kept open per rendering process, one per session (least recently used are closed)
+RENDER_CACHED_PAGES = int(os.getenv('RENDER_CACHED_PAGES', '8'))
+
+# Template environment shared by every render in this process
+jinja_env = Environment(loader=FileSystemLoader(BASE_DIR))
+
+
+# =============================================================================
+# HELPER FUNCTION: convert_markdown_to_html
+# =============================================================================
+def convert_markdown_to_html(markdown_text):
+    """
+    Converts Markdown-formatted text to HTML.
+
+    Parameters:
+        markdown_text (str): The input text in Markdown format.
+
+    Returns:
+        str: The HTML-converted text.
+    """
+    return markdown_to_html(markdown_text)
+
+
+# =============================================================================
+# HELPER FUNCTION: html_to_pdf_playwright
+# =============================================================================
+def html_to_pdf_playwright(html_content: str, pdf_path: str = None, timeout: float = RENDER_TIMEOUT):
+    """
+    Generates a PDF file from HTML content using Playwright.
+
+    Parameters:
+        html_content (str): HTML content to render.
+        pdf_path (str | None): Path where the generated PDF will be saved, if any.
+        timeout (float): Seconds allowed for page loading and printing.
+
+    Returns:
+        bytes: The generated PDF.
+    """
+    # The temporary file lives next to style.css so the stylesheet link still resolves
+    with tempfile.NamedTemporaryFile(mode="w", encoding="utf-8", prefix="tmp_", suffix=".html",
+                                     dir=BASE_DIR, delete=False) as tmp_html:
+        tmp_html.write(html_content)
+        tmp_html_path = tmp_html.name
+
+    file_url = f"file://{os.path.abspath(tmp_html_path)}"
+
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch()
+            page = browser.new_page()
+            page.set_default_timeout(timeout * 1000)
+            page.goto(file_url)
+            pdf_bytes = page.pdf(path=pdf_path, format="A4")
+            browser.close()
+    finally:
+        os.remove(tmp_html_path)
+
+    return pdf_bytes
+
+
+# =============================================================================
+# WARM PAGES (state of each rendering process)
+# =============================================================================
+# Each rendering process keeps one browser and, per session, a page with the
+# template, the CSS and the fonts already loaded. Regenerating a CV only replaces
+# the header name and the cv-content DOM before printing again, skipping the
+# browser launch, the navigation, the stylesheet parsing and the font loading.
+
+_playwright = None
+_browser = None
+_shell_path = None
+_pages = OrderedDict()
+
+# Replaces the CV of a warm page and waits for any font used by the new content
+PATCH_CV_SCRIPT = """([name, content]) => {
+    document.querySelector('.cv-header .name').textContent = name;
+    document.querySelector('.cv-content').innerHTML = content;
+    return document.fonts.ready.then(() => true);
+}"""
+
+
+def _close_browser():
+    """
+    Closes the warm pages, the browser and Playwright of this process.
+    """
+    global _playwright, _browser, _shell_path
+    _pages.clear()
+    try:
+        if _browser is not None:
+            _browser.close()
+        if _playwright is not None:
+            _playwright.stop()
+    except Exception:
+        pass
+    if _shell_path and os.path.exists(_shell_path):
+        os.remove(_shell_path)
+    _playwright = _browser = _shell_path = None
+
+
+atexit.register(_close_browser)
+
+
+def _session_page(session_key, timeout):
+    """
+    Returns the warm page of a session, creating it (and the browser) if needed.
+    """
+    global _playwright, _browser, _shell_path
+    if session_key in _pages:
+        _pages.move_to_end(session_key)
+        return _pages[session_key]
+
+    if _browser is None:
+        _playwright = sync_playwright().start()
+        _browser = _playwright.chromium.launch()
+
+        # Template with an empty CV; the temporary file lives next to style.css
+        shell_html = jinja_env.get_template('template.html').render(
+            cv_content='<div class="cv-header"><h1 class="name"></h1></div><div class="cv-content"></div>'
+        )
+        with tempfile.NamedTemporaryFile(mode="w", encoding="utf-8", prefix="tmp_shell_", suffix=".html",
+                                         dir=BASE_DIR, delete=False) as shell:
+            shell.write(shell_html)
+            _shell_path = shell.name
+
+    page = _browser.new_page()
+    try:
+        page.set_default_timeout(timeout * 1000)
+        page.goto(f"file://{os.path.abspath(_shell_path)}")
+    except Exception:
+        page.close()
+        raise
+
+    _pages[session_key] = page
+    if len(_pages) > RENDER_CACHED_PAGES:
+        _, oldest = _pages.popitem(last=False)
+        oldest.close()
+    return page
+
+
+def render_warm_pdf(session_key, cv_name, cv_body_html, timeout=RENDER_TIMEOUT):
+    """
+    Prints a CV with the warm page of a session, patching only its content.
+
+    Parameters:
+        session_key (str): Identifier of the user session.
+        cv_name (str): Name shown in the CV header.
+        cv_body_html (str): HTML placed in the cv-content element.
+        timeout (float): Seconds allowed for the page operations.
+
+    Returns:
+        bytes: The generated PDF.
+    """
+    if _browser is not None and not _browser.is_connected():
+        # The browser crashed since the last render: the next page starts a new one
+        _close_browser()
+
+    page = _session_page(session_key, timeout)
+    try:
+        page.set_default_timeout(timeout * 1000)
+        page.evaluate(PATCH_CV_SCRIPT, [cv_name, cv_body_html])
+        return page.pdf(format="A4")
+    except Exception:
+        if not _browser.is_connected():
+            _close_browser()
+        else:
+            # Only this session's page is dropped; the other sessions keep theirs
+            _pages.pop(session_key, None)
+            try:
+                page.close()
+            except Exception:
+                pass
+        raise
+
+
+# =============================================================================
+# HELPER FUNCTION: render_cv_pdf
+# =============================================================================
+def render_cv_pdf(cv_name, markdown_text, timeout=RENDER_TIMEOUT, session_key=None):
+    """
+    Runs the whole CV document pipeline: Markdown to HTML, template rendering and PDF printing.
+
+    Parameters:
+        cv_name (str): Name shown in the CV header.
+        markdown_text (str): CV body in Markdown format.
+        timeout (float): Seconds allowed for the PDF printing step.
+        session_key (str | None): User session. When given, the session's warm page is
+            reused and only the CV content is replaced; otherwise a fresh browser is used.
+
+    Returns:
+        bytes: The generated PDF.
+    """
+    processed_html = cv_markdown_to_html(markdown_text)
+    if session_key:
+        return render_warm_pdf(session_key, cv_name, processed_html, timeout)
+
+    cv_header = f'<div class="cv-header"><h1 class="name">{cv_name}</h1></div>'
+    cv_content_html = f'{cv_header}<div class="cv-content">{processed_html}</div>'
+
+    template = jinja_env.get_template('template.html')
+    html_content = template.render(cv_content=cv_content_html)
+
+    return html_to_pdf_playwright(html_content, timeout=timeout)
+
+
+# =============================================================================
+# CLASS: RenderPool
+# =============================================================================
+class RenderPool:
+    """
+    Rendering processes with a bounded queue that render CV PDFs in the background.
+
+    Each process is a single-worker executor, so that all the jobs of a session go
+    to the same process and reuse its warm page. When that process is busy and
+    another one is idle, the job is rendered cold on the idle one instead of
+    waiting behind other sessions.
+    """
+
+    def __init__(self, workers=RENDER_WORKERS, queue_depth=RENDER_QUEUE_DEPTH):
+        self.workers = workers
+        self._executors = None
+        self._lock = threading.Lock()
+        # Jobs submitted to each process and not finished yet
+        self._in_flight = [0] * workers
+        # Jobs running plus jobs waiting for a free worker
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+
+    def _pick_worker(self, session_key=None):
+        """
+        Chooses the process for a job and counts the job as in flight on it.
+
+        Returns:
+            tuple[int, str | None]: The process index and the session key to render
+            with, which is None when the job is sent cold to an idle process.
+        """
+        with self._lock:
+            if self._executors is None:
+                if "forkserver" in multiprocessing.get_all_start_methods():
+                    context = multiprocessing.get_context("forkserver")
+                    context.set_forkserver_preload(["document_pipeline"])
+                else:
+                    context = multiprocessing.get_context("spawn")
+                self._executors = [
+                    ProcessPoolExecutor(max_workers=1, mp_context=context) for _ in range(self.workers)
+                ]
+            if session_key:
+                index = int(hashlib.md5(session_key.encode("utf-8")).hexdigest(), 16) % self.workers
+                if self._in_flight[index] > 0 and 0 in self._in_flight:
+                    index = self._in_flight.index(0)
+                    session_key = None
+            else:
+                index = self._in_flight.index(min(self._in_flight))
+            self._in_flight[index] += 1
+            return index, session_key
+
+    def _job_done(self, index):
+        with self._lock:
+            self._in_flight[index] -= 1
+        self._slots.release()
+
+    def submit(self, cv_name, markdown_text, timeout=RENDER_TIMEOUT, session_key=None):
+        """
+        Submits a CV rendering job.
+
+        Parameters:
+            cv_name (str): Name shown in the CV header.
+            markdown_text (str): CV body in Markdown format.
+            timeout (float): Seconds allowed for the PDF printing step.
+            session_key (str | None): User session, used to reuse its warm page.
+
+        Returns:
+            concurrent.futures.Future: A future resolving to the PDF bytes. Calling
+            cancel() on it drops the job if it has not started yet.
+
+        Raises:
+            RuntimeError: If the queue is full.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise RuntimeError("Too many documents are being generated right now. Please try again in a moment.")
+        index, session_key = self._pick_worker(session_key)
+        try:
+            future = self._executors[index].submit(render_cv_pdf, cv_name, markdown_text, timeout, session_key)
+        except Exception:
+            self._job_done(index)
+            raise
+        future.add_done_callback(lambda _: self._job_done(index))
+        return future
+
+    def render(self, cv_name, markdown_text, timeout=RENDER_TIMEOUT, session_key=None):
+        """
+        Submits a job and waits for its result.
+
+        Parameters:
+            cv_name (str): Name shown in the CV header.
+            markdown_text (str): CV body in Markdown format.
+            timeout (float): Seconds allowed for the job, including the time spent waiting in the queue.
+            session_key (str | None): User session, used to reuse its warm page.
+
+        Returns:
+            bytes: The generated PDF.
+
+        Raises:
+            TimeoutError: If the job does not finish in time. The job is cancelled if it has not started.
+        """
+        future = self.submit(cv_name, markdown_text, timeout, session_key)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def shutdown(self):
+        """
+        Cancels the queued jobs and stops the worker processes.
+        """
+        with self._lock:
+            for executor in self._executors or []:
+                executor.shutdown(wait=False, cancel_futures=True)
+            self._executors = None
+
+
+# Shared pool used by the Gradio handlers
+render_pool = RenderPool()
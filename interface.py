@@ -0,0 +1,289 @@
+import gradio as gr
+from advanced_features import extract_key_requirements, create_cover_letter, cv_agent
+from advanced_features import resume_cv_agent, edit_cv_agent_answer, improve_agent_cv
+from basic_functions import action_manager, render_improved_cv
+from request_limits import report_memory, MAX_INPUT_CHARS
+from model import routing_stats
+from answer_analyzer import analyzer_stats
+
+# =============================================================================
+# FUNCTION: update_output_visibility
+# =============================================================================
+def update_output_visibility(action):
+    """
+    Updates the visibility of output components depending on the selected action.
+
+    Args:
+        action (str): The selected action (e.g., "improve_cv").
+
+    Returns:
+        Tuple: Gradio component visibility updates.
+    """
+    if action == "improve_cv":
+        return gr.update(visible=False), gr.update(visible=True)
+    else:
+        return gr.update(visible=True), gr.update(visible=False)
+
+# =============================================================================
+# THEME CONFIGURATION
+# =============================================================================
+theme = gr.themes.Ocean(
+    primary_hue="blue",
+    neutral_hue="gray",
+)
+
+# =============================================================================
+# GRADIO INTERFACE SETUP
+# =============================================================================
+# Files Gradio copies to its cache (the generated CVs) are deleted after an hour
+with gr.Blocks(theme=theme, title="Accessibility Assistant for Job Offers and CVs", delete_cache=(3600, 3600)) as demo:
+    gr.Markdown("""
+    <div style="display: flex; align-items: center; gap: 20px;">
+        <img src="https://upload.wikimedia.org/wikipedia/commons/5/51/IBM_logo.svg" alt="IBM Logo" width="120" />
+        <div>
+            <h1>Accessibility Assistant for Job Offers and CVs</h1>
+            <p>This tool helps make job offers and CVs more accessible through various text processing functions.</p>
+        </div>
+    </div>
+    """)
+
+    with gr.Tabs():
+        # =============================================================================
+        # TAB: Basic Functions
+        # =============================================================================
+        with gr.TabItem("Basic Functions"):
+            with gr.Row():
+                with gr.Column():
+                    input_text = gr.TextArea(
+                        label="Input Text (job offer or CV section)", 
+                        placeholder="Paste the text you want to process here...", 
+                        lines=10,
+                        max_length=MAX_INPUT_CHARS
+                    )
+                    action_type = gr.Radio(
+                        ["summarize", "improve_cv"],
+                        label="Select Action",
+                        value="summarize",
+                        info="'improve_cv' will generate a downloadable PDF."
+                    )
+                    submit_btn = gr.Button("Process Text")
+
+                with gr.Column():
+                    output_text_display = gr.TextArea(
+                        label="Result (Text)", 
+                        lines=15, 
+                        visible=True
+                    )
+                    output_file_display = gr.File(
+                        label="Download Generated PDF", 
+                        visible=False
+                    )
+
+            def process_basic_action(text, action, request: gr.Request):
+                return action_manager(text, action, session_key=request.session_hash)
+
+            submit_btn.click(
+                fn=report_memory(process_basic_action),
+                inputs=[input_text, action_type],
+                outputs=[output_text_display, output_file_display],
+                api_name="action_manager"
+            )
+
+            action_type.change(
+                fn=update_output_visibility,
+                inputs=action_type,
+                outputs=[output_text_display, output_file_display]
+            )
+        # =============================================================================
+        # TAB: Key Requirements Extraction
+        # =============================================================================
+        with gr.TabItem("Key Requirements Extraction"):
+            with gr.Row():
+                with gr.Column():
+                    job_description = gr.TextArea(
+                        label="Job Description", 
+                        placeholder="Paste the job posting here...", 
+                        lines=10,
+                        max_length=MAX_INPUT_CHARS
+                    )
+                    extract_btn = gr.Button("Extract Requirements")
+                
+                with gr.Column():
+                    requirements_output = gr.TextArea(
+                        label="Extracted Requirements", 
+                        lines=10
+                    )
+            
+            extract_btn.click(
+                fn=report_memory(extract_key_requirements),
+                inputs=job_description,
+                outputs=requirements_output
+            )
+        
+        # =============================================================================
+        # TAB: CV Assistant Agent
+        # =============================================================================
+        with gr.TabItem("CV Assistant"):
+            with gr.Row():
+                with gr.Column():
+                    job_description_input = gr.TextArea(
+                        label="Job Posting",
+                        placeholder="Paste the job posting you want to tailor your CV for...",
+                        lines=10,
+                        max_length=MAX_INPUT_CHARS
+                    )
+                    user_input = gr.TextArea(
+                        label="Your Response",
+                        placeholder="Type your response to the assistant's question here...",
+                        lines=5,
+                        max_length=MAX_INPUT_CHARS
+                    )
+                    agent_btn = gr.Button("Start / Respond")
+
+                    with gr.Accordion("Resume or edit a conversation", open=False):
+                        session_id_input = gr.Textbox(
+                            label="Session ID",
+                            placeholder="Paste the session ID given at the start of a conversation..."
+                        )
+                        resume_btn = gr.Button("Resume Session")
+                        edit_stage = gr.Dropdown(
+                            choices=[
+                                ("Personal information", "personal_info"),
+                                ("Work experience", "work_experience"),
+                                ("Education", "education"),
+                                ("Skills", "skills"),
+                            ],
+                            label="Answer to edit",
+                            info="Type the new answer in 'Your Response'. Only this part is processed again."
+                        )
+                        edit_btn = gr.Button("Edit Answer & Regenerate CV")
+
+                with gr.Column():
+                    agent_output = gr.TextArea(
+                        label="CV Assistant",
+                        lines=10,
+                        value="Welcome to the CV creation assistant. To begin, paste a job posting and click 'Start'."
+                    )
+                    agent_cv_output = gr.File(
+                        label="Download Generated CV",
+                        visible=False
+                    )
+
+            # State to maintain conversation context
+            agent_context = gr.State(None)
+
+            def build_agent_response(message, new_context, cv_ready):
+                if cv_ready:
+                    # The CV texts are reused from the context (or its checkpoint) when already generated
+                    error, cv_text, improved_cv = improve_agent_cv(new_context)
+                    pdf_path = None
+                    if not error:
+                        _, pdf_path = render_improved_cv(cv_text, improved_cv, session_key=new_context.get("session_id"))
+
+                    if pdf_path:
+                        return message, new_context, gr.update(visible=True, value=pdf_path)
+                    else:
+                        return message + "\n\nAn error occurred while generating the PDF. Please try again.", new_context, gr.update(visible=False)
+
+                return message, new_context, gr.update(visible=False)
+
+            def process_agent_interaction(job_desc, user_response, context):
+                if not job_desc.strip():
+                    return "Please provide a job posting first.", context, gr.update(visible=False)
+
+                message, new_context, cv_ready = cv_agent(job_desc, user_response, context)
+
+                #print(f'MESSAGE:\n{message}')
+                #print(f'NEW CONTEXT:\n{new_context}')
+
+                return build_agent_response(message, new_context, cv_ready)
+
+            def resume_agent_session(session_id):
+                message, context, cv_ready = resume_cv_agent(session_id)
+                job_desc = context["data"]["job_posting"]["description"] if context else gr.update()
+                return (job_desc, *build_agent_response(message, context, cv_ready))
+
+            def edit_agent_answer(job_desc, user_response, context, stage):
+                message, new_context, cv_ready = edit_cv_agent_answer(job_desc, user_response, context, stage)
+                return build_agent_response(message, new_context, cv_ready)
+
+            agent_btn.click(
+                fn=report_memory(process_agent_interaction),
+                inputs=[job_description_input, user_input, agent_context],
+                outputs=[agent_output, agent_context, agent_cv_output]
+            )
+
+            resume_btn.click(
+                fn=report_memory(resume_agent_session),
+                inputs=session_id_input,
+                outputs=[job_description_input, agent_output, agent_context, agent_cv_output]
+            )
+
+            edit_btn.click(
+                fn=report_memory(edit_agent_answer),
+                inputs=[job_description_input, user_input, agent_context, edit_stage],
+                outputs=[agent_output, agent_context, agent_cv_output]
+            )
+
+        # =============================================================================
+        # TAB: Cover Letter Generator
+        # =============================================================================
+        with gr.TabItem("Cover Letter"):
+            with gr.Row():
+                with gr.Column():
+                    cv_text = gr.TextArea(
+                        label="Your CV", 
+                        placeholder="Paste your CV here...", 
+                        lines=10,
+                        max_length=MAX_INPUT_CHARS
+                    )
+                    job_text = gr.TextArea(
+                        label="Job Posting", 
+                        placeholder="Paste the job posting here...", 
+                        lines=10,
+                        max_length=MAX_INPUT_CHARS
+                    )
+                    cover_letter_btn = gr.Button("Generate Cover Letter")
+                
+                with gr.Column():
+                    cover_letter_output = gr.TextArea(
+                        label="Generated Cover Letter", 
+                        lines=15
+                    )
+            
+            cover_letter_btn.click(
+                fn=report_memory(create_cover_letter),
+                inputs=[cv_text, job_text],
+                outputs=cover_letter_output
+            )
+
+
+    # =============================================================================
+    # MODEL ROUTING STATISTICS
+    # =============================================================================
+    with gr.Accordion("Model routing statistics", open=False):
+        stats_output = gr.JSON(label="Per-tier latency and cost")
+        analyzer_output = gr.JSON(label="Work experience answers resolved without the model")
+        stats_btn = gr.Button("Refresh")
+
+    stats_btn.click(
+        fn=routing_stats,
+        inputs=None,
+        outputs=stats_output
+    )
+
+    stats_btn.click(
+        fn=analyzer_stats,
+        inputs=None,
+        outputs=analyzer_output
+    )
+
+    # =============================================================================
+    # FOOTER
+    # =============================================================================
+    gr.Markdown("""
+    ### Developed for the IBM Challenge SDG8
+
+    This project contributes to Sustainable Development Goal 8: "Decent Work and Economic Growth",
+    by improving access to employment through clearer and more inclusive language.
+    """)
@@ -0,0 +1,296 @@
+import os
+import re
+import time
+import random
+import argparse
+import threading
+from collections import defaultdict
+from gradio_client import Client
+from gradio_client.utils import Status
+
+# =============================================================================
+# LOAD TEST HARNESS
+# =============================================================================
+# Simulates concurrent users of app.py through the Gradio queue API. Each virtual
+# user has its own Client (and therefore its own Gradio session and gr.State) and
+# loops over scripted sessions until the current ramp stage ends.
+#
+# Start the app against the stub backend, then run the harness:
+#     MODEL_BACKEND=stub python app.py
+#     python load_test.py --url http://127.0.0.1:7860 --ramp 1,4,8,16 --server-pid <pid>
+
+JOB_POSTING = """Backend Developer (Python)
+We are looking for a backend developer with 3+ years of experience in Python, SQL and Docker.
+You will design APIs, maintain our billing platform and collaborate with the product team.
+Remote work is possible. English level B2 or higher is required."""
+
+CV_TEXT = """Jane Doe
+Email: jane.doe@example.com | Phone: +34 600 000 000
+Backend developer at Acme Corp (2019 - 2024): migrated billing services to Python microservices.
+BSc in Computer Science, University of Madrid, 2018.
+Skills: Python, SQL, Docker, teamwork."""
+
+CV_ASSISTANT_TURNS = [
+    "",
+    "My name is Jane Doe, email jane.doe@example.com, phone +34 600 000 000.",
+    "Backend developer at Acme Corp from 2019 to 2024. I migrated the billing platform to Python microservices.",
+    "BSc in Computer Science, University of Madrid, 2018.",
+    "Python, SQL, Docker, communication and teamwork.",
+]
+
+# The handlers report failures as returned messages, not exceptions
+ERROR_RESULT_RE = re.compile(r'^Error\b|An (?:unexpected )?error occurred|Too many documents')
+
+
+# =============================================================================
+# CLASS: Metrics
+# =============================================================================
+class Metrics:
+    """
+    Thread-safe collector of per-endpoint latencies, queue waits and errors.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.queue_waits = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.rss_samples = []
+        self.browser_samples = []
+
+    def record(self, endpoint, latency, queue_wait, error):
+        with self.lock:
+            self.latencies[endpoint].append(latency)
+            if queue_wait is not None:
+                self.queue_waits[endpoint].append(queue_wait)
+            if error:
+                self.errors[endpoint] += 1
+
+    def record_resources(self, rss, browsers):
+        with self.lock:
+            self.rss_samples.append(rss)
+            self.browser_samples.append(browsers)
+
+
+# =============================================================================
+# HELPER FUNCTION: is_error_result
+# =============================================================================
+def is_error_result(result):
+    """
+    Tells whether an endpoint output holds one of the error messages of the app.
+    """
+    outputs = result if isinstance(result, (list, tuple)) else [result]
+    return any(isinstance(output, str) and ERROR_RESULT_RE.search(output) for output in outputs)
+
+
+# =============================================================================
+# HELPER FUNCTION: call_endpoint
+# =============================================================================
+def call_endpoint(client, metrics, api_name, *args):
+    """
+    Calls an endpoint through the queue and records its latency and queue wait.
+    Exceptions and returned error messages both count as errors. The queue wait
+    is left out when the job was never seen processing between two polls.
+
+    Returns:
+        The endpoint output, or None if the call raised.
+    """
+    start = time.perf_counter()
+    queue_wait = None
+    try:
+        job = client.submit(*args, api_name=api_name)
+        while not job.done():
+            if queue_wait is None and job.status().code in (Status.PROCESSING, Status.ITERATING, Status.PROGRESS):
+                queue_wait = time.perf_counter() - start
+            time.sleep(0.02)
+        result = job.result()
+        error = is_error_result(result)
+    except Exception:
+        result = None
+        error = True
+    latency = time.perf_counter() - start
+    metrics.record(api_name, latency, queue_wait, error)
+    return result
+
+
+# =============================================================================
+# SCRIPTED SESSIONS
+# =============================================================================
+def cv_assistant_session(client, metrics):
+    """
+    Full multi-turn CV Assistant conversation, ending with the PDF generation.
+    """
+    for turn in CV_ASSISTANT_TURNS:
+        call_endpoint(client, metrics, "/process_agent_interaction", JOB_POSTING, turn)
+
+
+def summarize_burst_session(client, metrics):
+    """
+    Several summaries requested back to back.
+    """
+    for _ in range(random.randint(3, 6)):
+        call_endpoint(client, metrics, "/action_manager", JOB_POSTING, "summarize")
+
+
+def cover_letter_session(client, metrics):
+    """
+    A single cover letter request.
+    """
+    call_endpoint(client, metrics, "/create_cover_letter", CV_TEXT, JOB_POSTING)
+
+
+SESSIONS = [
+    (cv_assistant_session, 0.4),
+    (summarize_burst_session, 0.4),
+    (cover_letter_session, 0.2),
+]
+
+
+def virtual_user(url, metrics, stop_event):
+    """
+    Runs random scripted sessions, each in a fresh Gradio session, until told to stop.
+    """
+    functions, weights = zip(*SESSIONS)
+    while not stop_event.is_set():
+        try:
+            client = Client(url, verbose=False)
+        except Exception:
+            metrics.record("connect", 0.0, None, True)
+            time.sleep(1)
+            continue
+        random.choices(functions, weights)[0](client, metrics)
+        client.close()
+
+
+# =============================================================================
+# RESOURCE SAMPLING (Linux /proc)
+# =============================================================================
+def process_tree(root_pid):
+    """
+    Returns the pids of a process and all its descendants.
+    """
+    children = defaultdict(list)
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat:
+                ppid = int(stat.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children[ppid].append(int(entry))
+
+    pids, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children[pid])
+    return pids
+
+
+def sample_resources(server_pid):
+    """
+    Measures the server's total RSS (MB, including child processes) and its number of browser processes.
+    """
+    rss_kb, browsers = 0, 0
+    for pid in process_tree(server_pid):
+        try:
+            with open(f"/proc/{pid}/comm") as comm:
+                if any(name in comm.read() for name in ("chrome", "chromium", "headless_shell")):
+                    browsers += 1
+            with open(f"/proc/{pid}/status") as status:
+                for line in status:
+                    if line.startswith("VmRSS:"):
+                        rss_kb += int(line.split()[1])
+        except OSError:
+            continue
+    return rss_kb / 1024, browsers
+
+
+def resource_sampler(server_pid, metrics, stop_event, interval=1.0):
+    while not stop_event.wait(interval):
+        metrics.record_resources(*sample_resources(server_pid))
+
+
+# =============================================================================
+# REPORTING
+# =============================================================================
+def percentile(values, pct):
+    """
+    Nearest-rank percentile of a list of values.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def print_report(users, duration, metrics):
+    print(f"\n=== {users} concurrent users, {duration:.0f}s ===")
+    print(f"{'endpoint':<28}{'calls':>7}{'err%':>7}{'p50':>8}{'p90':>8}{'p99':>8}{'queue p50':>11}{'queue p95':>11}")
+    for endpoint, latencies in sorted(metrics.latencies.items()):
+        waits = metrics.queue_waits[endpoint]
+        error_rate = 100 * metrics.errors[endpoint] / len(latencies)
+        print(f"{endpoint:<28}{len(latencies):>7}{error_rate:>7.1f}"
+              f"{percentile(latencies, 50):>8.2f}{percentile(latencies, 90):>8.2f}{percentile(latencies, 99):>8.2f}"
+              f"{percentile(waits, 50):>11.2f}{percentile(waits, 95):>11.2f}")
+    if metrics.rss_samples:
+        print(f"Server RSS: max {max(metrics.rss_samples):.0f} MB, "
+              f"avg {sum(metrics.rss_samples) / len(metrics.rss_samples):.0f} MB; "
+              f"browser processes: max {max(metrics.browser_samples)}")
+
+
+# =============================================================================
+# FUNCTION: run_stage
+# =============================================================================
+def run_stage(url, users, duration, server_pid=None):
+    """
+    Runs a fixed number of virtual users for a given time and returns the collected metrics.
+    """
+    metrics = Metrics()
+    stop_event = threading.Event()
+    threads = [threading.Thread(target=virtual_user, args=(url, metrics, stop_event), daemon=True)
+               for _ in range(users)]
+    if server_pid:
+        threads.append(threading.Thread(target=resource_sampler, args=(server_pid, metrics, stop_event), daemon=True))
+
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop_event.set()
+    # Let the sessions in flight finish so their latencies are counted
+    for thread in threads:
+        thread.join()
+    return metrics
+
+
+# =============================================================================
+# RUN LOAD TEST
+# =============================================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the Gradio app with simulated users.")
+    parser.add_argument("--url", default="http://127.0.0.1:7860", help="URL of the running app.")
+    parser.add_argument("--ramp", default="1,2,4,8", help="Comma-separated concurrent user counts, one per stage.")
+    parser.add_argument("--stage-duration", type=float, default=60, help="Seconds each stage runs.")
+    parser.add_argument("--server-pid", type=int, help="Pid of the app (or serve.py) process, to sample RSS and browsers.")
+    args = parser.parse_args()
+
+    for users in (int(n) for n in args.ramp.split(",")):
+        stage_metrics = run_stage(args.url, users, args.stage_duration, args.server_pid)
+        print_report(users, args.stage_duration, stage_metrics)
+
+    # Per-tier statistics of the model router (cumulative over the whole run)
+    try:
+        print("\nModel routing statistics:")
+        for tier, stats in Client(args.url, verbose=False).predict(api_name="/routing_stats").items():
+            print(f"  {tier}: {stats}")
+    except Exception as e:
+        print(f"  unavailable ({e})")
+
+    # Share of work experience answers the local analyzer resolved without the model
+    try:
+        print("\nAnswer analyzer statistics:")
+        print(f"  {Client(args.url, verbose=False).predict(api_name='/analyzer_stats')}")
+    except Exception as e:
+        print(f"  unavailable ({e})")
@@ -1,30 +1,154 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from ibm_watsonx_ai import APIClient
 from ibm_watsonx_ai import Credentials
 from ibm_watsonx_ai.foundation_models import ModelInference
+from cache import is_cacheable, cache_key, cache_get, cache_set
+from model_router import Tier, ModelRouter
 load_dotenv()
 
 api_key = os.getenv('WATSONX_API_KEY')
 url = os.getenv('WATSONX_URL')
 project_id = os.getenv('WATSONX_PROJECT_ID')
 
-# Initialize WatsonX client
-credentials = Credentials(
-    url=url,
-    api_key=api_key,
-)
-client = APIClient(credentials)
-
-model = ModelInference(
-    model_id="ibm/granite-3-8b-instruct",
-    api_client=client,
-    project_id=project_id,
-    params={
-        "max_new_tokens": 1024,  # Aumentado a 1024
-        "temperature": 0.4, # Reducido ligeramente para mayor coherencia
-    }
-)
-
-def model_response(prompt):
-    return model.generate_text(prompt)
\ No newline at end of file
+# Maximum number of prompts sent to WatsonX at the same time by model_responses
+concurrency_limit = int(os.getenv('WATSONX_CONCURRENCY_LIMIT', '5'))
+
+# Model tiers: a small model for extraction/classification, the larger one for long-form writing.
+# Latency SLOs are in seconds; costs are per 1000 tokens and only used for the statistics.
+fast_model_id = os.getenv('MODEL_FAST_ID', "ibm/granite-3-2b-instruct")
+quality_model_id = os.getenv('MODEL_QUALITY_ID', "ibm/granite-3-8b-instruct")
+fast_slo = float(os.getenv('MODEL_FAST_SLO', '3'))
+quality_slo = float(os.getenv('MODEL_QUALITY_SLO', '20'))
+fast_cost = float(os.getenv('MODEL_FAST_COST', '0.0001'))
+quality_cost = float(os.getenv('MODEL_QUALITY_COST', '0.0002'))
+
+# Largest max_new_tokens each tier is used with; every call passes the token budget
+# of its task (model_router.TASK_MAX_NEW_TOKENS), and tasks needing more than a
+# tier's ceiling never run on that tier
+fast_max_tokens = int(os.getenv('MODEL_FAST_MAX_TOKENS', '512'))
+quality_max_tokens = int(os.getenv('MODEL_QUALITY_MAX_TOKENS', '1024'))
+
+fast_params = {
+    "max_new_tokens": fast_max_tokens,
+    "temperature": 0.2,
+}
+quality_params = {
+    "max_new_tokens": quality_max_tokens,  # Aumentado a 1024
+    "temperature": 0.4, # Reducido ligeramente para mayor coherencia
+}
+
+if os.getenv('MODEL_BACKEND') == 'stub':
+    # Offline backend for load testing, no credentials needed
+    from stub_model import StubModelInference, STUB_MODEL_LATENCY
+    fast_model = StubModelInference(model_id=fast_model_id, latency=STUB_MODEL_LATENCY / 2)
+    model = StubModelInference(model_id=quality_model_id)
+else:
+    # Initialize WatsonX client
+    credentials = Credentials(
+        url=url,
+        api_key=api_key,
+    )
+    client = APIClient(credentials)
+
+    fast_model = ModelInference(
+        model_id=fast_model_id,
+        api_client=client,
+        project_id=project_id,
+        params=fast_params
+    )
+
+    model = ModelInference(
+        model_id=quality_model_id,
+        api_client=client,
+        project_id=project_id,
+        params=quality_params
+    )
+
+router = ModelRouter([
+    Tier("fast", fast_model, slo=fast_slo, params=fast_params,
+         max_new_tokens=fast_max_tokens, cost_per_1k_tokens=fast_cost),
+    Tier("quality", model, slo=quality_slo, params=quality_params,
+         max_new_tokens=quality_max_tokens, cost_per_1k_tokens=quality_cost),
+])
+
+def model_response(prompt, task=None):
+    """
+    Generates a response with the model tier suited to the task.
+
+    Args:
+        prompt (str): The prompt to send.
+        task (str | None): Task name used for routing (see model_router.TASK_TIERS).
+            Unknown or missing tasks use the larger model.
+
+    Returns:
+        str: The model response.
+    """
+    cacheable = is_cacheable(task)
+    candidates = router.candidates(task)
+    if cacheable and candidates:
+        cached = cache_get(cache_key(candidates[0].model_id, prompt))
+        if cached is not None:
+            return cached
+    response, tier = router.generate(prompt, task)
+    if cacheable:
+        cache_set(cache_key(tier.model_id, prompt), response)
+    return response
+
+def model_responses(prompts, task=None, concurrency=concurrency_limit):
+    """
+    Generates responses for several independent prompts in a single dispatch.
+
+    The whole batch is first sent through the SDK's multi-prompt generation.
+    If that call fails, every prompt is retried on its own so that one bad
+    prompt does not lose the answers of the others.
+
+    Args:
+        prompts (list[str]): Prompts to send to the model.
+        task (str | None): Task name used for routing.
+        concurrency (int): Maximum number of requests in flight at once.
+
+    Returns:
+        list[str | Exception]: One entry per prompt, in the same order. Failed
+        prompts hold the exception that was raised instead of the text.
+    """
+    prompts = list(prompts)
+    if not prompts:
+        return []
+
+    # Only the prompts missing from the shared cache are sent to the model
+    cacheable = is_cacheable(task)
+    candidates = router.candidates(task)
+    model_id = candidates[0].model_id if cacheable and candidates else None
+    results = [cache_get(cache_key(model_id, prompt)) if model_id else None for prompt in prompts]
+    pending = [i for i, result in enumerate(results) if result is None]
+    if not pending:
+        return results
+
+    try:
+        responses, tier = router.generate([prompts[i] for i in pending], task, concurrency)
+        for i, response in zip(pending, responses):
+            results[i] = response
+            if cacheable:
+                cache_set(cache_key(tier.model_id, prompts[i]), response)
+        return results
+    except Exception:
+        pass
+
+    def safe_response(prompt):
+        try:
+            return model_response(prompt, task)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(pending))) as executor:
+        for i, response in zip(pending, executor.map(safe_response, [prompts[i] for i in pending])):
+            results[i] = response
+    return results
+
+def routing_stats():
+    """
+    Returns per-tier latency, error and cost statistics.
+    """
+    return router.stats()
@@ -0,0 +1,219 @@
+import time
+import threading
+from collections import deque
+
+# =============================================================================
+# MODEL ROUTER
+# =============================================================================
+# Sends each task to a model tier: a small, fast model for extraction and
+# classification prompts, and the larger model for long-form writing. A tier
+# whose recent latency exceeds its SLO, or that keeps failing, is skipped in
+# favour of the next one, and a failed call is retried on the other tier.
+
+# Task name -> preferred tier
+TASK_TIERS = {
+    "extraction": "fast",
+    "classification": "fast",
+    "job_analysis": "fast",
+    "requirements": "fast",
+    "summarize": "fast",
+    "improve_cv": "quality",
+    "cover_letter": "quality",
+    "cv_generation": "quality",
+}
+
+# Task name -> max_new_tokens needed by its answers. A tier whose max_new_tokens
+# ceiling is below a task's budget is never used for that task, not even as a fallback,
+# so long-form answers are never cut off by the small model.
+TASK_MAX_NEW_TOKENS = {
+    "extraction": 64,
+    "classification": 128,
+    "job_analysis": 256,
+    "requirements": 512,
+    "summarize": 300,
+    "improve_cv": 1024,
+    "cover_letter": 1024,
+    "cv_generation": 1024,
+}
+DEFAULT_MAX_NEW_TOKENS = 1024
+
+# Number of recent calls used to check a tier's latency against its SLO
+LATENCY_WINDOW = 20
+# Consecutive failures after which a tier is considered down
+MAX_CONSECUTIVE_ERRORS = 3
+# Seconds a slow or failing tier is skipped before it gets traffic again
+TIER_COOLDOWN = 30.0
+
+
+# =============================================================================
+# CLASS: Tier
+# =============================================================================
+class Tier:
+    """
+    A model together with its generation params, latency SLO, cost and call statistics.
+    """
+
+    def __init__(self, name, model, slo, params, max_new_tokens, cost_per_1k_tokens=0.0):
+        self.name = name
+        self.model = model
+        self.slo = slo
+        self.params = params
+        self.max_new_tokens = max_new_tokens
+        self.cost_per_1k_tokens = cost_per_1k_tokens
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.calls = 0
+        self.errors = 0
+        self.fallbacks = 0
+        self.tokens = 0
+        self.consecutive_errors = 0
+        self.disabled_until = 0.0
+
+    @property
+    def model_id(self):
+        return self.model.model_id
+
+    def task_params(self, task):
+        """
+        Returns the generation params of the tier with the token budget of a task.
+        """
+        return dict(self.params, max_new_tokens=TASK_MAX_NEW_TOKENS.get(task, DEFAULT_MAX_NEW_TOKENS))
+
+    def is_healthy(self):
+        """
+        Whether the tier is not cooling down after being slow or failing.
+        """
+        return time.monotonic() >= self.disabled_until
+
+    def is_slow(self):
+        """
+        Whether the 90th percentile of the recent latencies exceeds the SLO.
+        """
+        if len(self.latencies) < LATENCY_WINDOW // 2:
+            return False
+        ordered = sorted(self.latencies)
+        return ordered[int(0.9 * (len(ordered) - 1))] > self.slo
+
+
+# =============================================================================
+# CLASS: ModelRouter
+# =============================================================================
+class ModelRouter:
+    """
+    Chooses a tier per task and falls back to another tier when needed.
+    """
+
+    def __init__(self, tiers, task_tiers=TASK_TIERS, default_tier="quality"):
+        self.tiers = {tier.name: tier for tier in tiers}
+        self.task_tiers = task_tiers
+        self.default_tier = default_tier
+        self._lock = threading.Lock()
+
+    def candidates(self, task=None):
+        """
+        Returns the tiers to try for a task, in order: healthy tiers first, starting
+        with the preferred one, then the unhealthy ones as a last resort. Tiers that
+        cannot produce the task's token budget are left out.
+
+        Args:
+            task (str | None): Task name, see TASK_TIERS.
+
+        Returns:
+            list[Tier]: The tiers to try.
+        """
+        preferred = self.task_tiers.get(task, self.default_tier)
+        budget = TASK_MAX_NEW_TOKENS.get(task, DEFAULT_MAX_NEW_TOKENS)
+        ordered = sorted(
+            (tier for tier in self.tiers.values() if tier.max_new_tokens >= budget),
+            key=lambda tier: tier.name != preferred
+        )
+        with self._lock:
+            healthy = [tier for tier in ordered if tier.is_healthy()]
+        return healthy + [tier for tier in ordered if tier not in healthy]
+
+    def record(self, tier, latency, prompt_chars, response_chars, error=False, fallback=False):
+        """
+        Updates the statistics of a tier after a call.
+        """
+        with self._lock:
+            tier.calls += 1
+            tier.fallbacks += fallback
+            if error:
+                tier.errors += 1
+                tier.consecutive_errors += 1
+                if tier.consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
+                    tier.disabled_until = time.monotonic() + TIER_COOLDOWN
+                    tier.consecutive_errors = 0
+            else:
+                tier.consecutive_errors = 0
+                tier.latencies.append(latency)
+                # Rough estimate: about four characters per token
+                tier.tokens += (prompt_chars + response_chars) // 4
+                if tier.is_slow():
+                    # Start over with a fresh window once the cooldown is over
+                    tier.disabled_until = time.monotonic() + TIER_COOLDOWN
+                    tier.latencies.clear()
+
+    def generate(self, prompt, task=None, concurrency=5):
+        """
+        Generates a response for a prompt or a list of prompts, trying the tiers in order.
+
+        Args:
+            prompt (str | list[str]): The prompt, or several independent prompts.
+            task (str | None): Task name used to pick the tier.
+            concurrency (int): Maximum requests in flight for a list of prompts.
+
+        Returns:
+            tuple[str | list[str], Tier]: The response(s) and the tier that produced them.
+
+        Raises:
+            Exception: The last error if every tier failed.
+            ValueError: If no tier can produce the task's token budget.
+        """
+        last_error = ValueError(f"No model tier can handle the task '{task}'.")
+        for position, tier in enumerate(self.candidates(task)):
+            start = time.perf_counter()
+            params = tier.task_params(task)
+            try:
+                if isinstance(prompt, list):
+                    response = tier.model.generate_text(prompt=prompt, params=params, concurrency_limit=concurrency)
+                else:
+                    response = tier.model.generate_text(prompt=prompt, params=params)
+            except Exception as e:
+                self.record(tier, time.perf_counter() - start, 0, 0, error=True, fallback=position > 0)
+                last_error = e
+                continue
+
+            latency = time.perf_counter() - start
+            prompts = prompt if isinstance(prompt, list) else [prompt]
+            responses = response if isinstance(response, list) else [response]
+            self.record(tier, latency, sum(map(len, prompts)), sum(len(r or "") for r in responses),
+                        fallback=position > 0)
+            return response, tier
+
+        raise last_error
+
+    def stats(self):
+        """
+        Returns the latency and cost statistics of every tier.
+
+        Returns:
+            dict: Tier name -> statistics.
+        """
+        with self._lock:
+            result = {}
+            for tier in self.tiers.values():
+                ordered = sorted(tier.latencies)
+                result[tier.name] = {
+                    "model_id": tier.model_id,
+                    "slo_seconds": tier.slo,
+                    "max_new_tokens": tier.max_new_tokens,
+                    "healthy": tier.is_healthy(),
+                    "calls": tier.calls,
+                    "errors": tier.errors,
+                    "fallback_calls": tier.fallbacks,
+                    "p50_seconds": ordered[len(ordered) // 2] if ordered else None,
+                    "p90_seconds": ordered[int(0.9 * (len(ordered) - 1))] if ordered else None,
+                    "estimated_tokens": tier.tokens,
+                    "estimated_cost": tier.tokens / 1000 * tier.cost_per_1k_tokens,
+                }
+            return result
@@ -0,0 +1,213 @@
+import re
+import threading
+import markdown
+
+# =============================================================================
+# OUTPUT PROCESSING
+# =============================================================================
+# Normalizes model responses in a single pass over their lines: placeholder lines
+# are dropped, section headers and bullets are rewritten as Markdown, and the HTML
+# is produced with a preconfigured Markdown instance reused across calls. Model
+# responses are bounded by max_new_tokens, so splitting them into lines is cheap.
+
+PLACEHOLDER_RE = re.compile(r'^\[.*\]$')
+# The colon of "**SKILLS:**" or "**SKILLS**:" is left out of the title
+BOLD_HEADER_RE = re.compile(r'^\*\*([^*]+?):?\*\*:?$')
+BULLET_CHARS = ('•', '●', '▪', '◦')
+
+# Words found in CV section titles, in English and Spanish. Other uppercase bold
+# lines, such as "**IBM | 2020 - 2023**", are entry titles and stay bold.
+SECTION_KEYWORDS = (
+    'INFORMATION', 'CONTACT', 'PROFILE', 'SUMMARY', 'OBJECTIVE', 'EXPERIENCE', 'EMPLOYMENT',
+    'EDUCATION', 'SKILLS', 'LANGUAGES', 'CERTIFICATIONS', 'PROJECTS', 'ACHIEVEMENTS', 'AWARDS',
+    'REFERENCES', 'INTERESTS', 'VOLUNTEER',
+    'INFORMACIÓN', 'PERFIL', 'RESUMEN', 'EXPERIENCIA', 'EDUCACIÓN', 'FORMACIÓN', 'HABILIDADES',
+    'IDIOMAS', 'CERTIFICACIONES', 'PROYECTOS', 'LOGROS', 'REFERENCIAS',
+)
+
+CONTACT_ICONS = {
+    'email': 'fa-envelope',
+    'phone': 'fa-phone',
+}
+CONTACT_RE = re.compile(r'<em>\s*(email|phone)\s*</em>', re.IGNORECASE)
+
+# markdown.Markdown instances are not thread-safe, so each thread keeps its own
+_local = threading.local()
+
+
+# =============================================================================
+# HELPER FUNCTION: get_markdown
+# =============================================================================
+def get_markdown():
+    """
+    Returns this thread's preconfigured Markdown converter.
+    """
+    md = getattr(_local, "md", None)
+    if md is None:
+        md = markdown.Markdown(extensions=['extra', 'nl2br'])
+        _local.md = md
+    return md
+
+
+# =============================================================================
+# FUNCTION: markdown_to_html
+# =============================================================================
+def markdown_to_html(markdown_text):
+    """
+    Converts Markdown to HTML with the reused converter.
+
+    Args:
+        markdown_text (str): The input text in Markdown format.
+
+    Returns:
+        str: The HTML-converted text.
+    """
+    md = get_markdown()
+    md.reset()
+    return md.convert(markdown_text)
+
+
+# =============================================================================
+# HELPER FUNCTION: is_section_header
+# =============================================================================
+def is_section_header(title):
+    """
+    Tells whether a bold line is a CV section title such as "EXPERIENCE".
+
+    Args:
+        title (str): Text between the ** markers.
+
+    Returns:
+        bool: True for uppercase titles holding a section word and no "|" or digits.
+    """
+    if not title.isupper() or '|' in title or any(char.isdigit() for char in title):
+        return False
+    return any(keyword in title for keyword in SECTION_KEYWORDS)
+
+
+# =============================================================================
+# FUNCTION: normalize_cv_markdown
+# =============================================================================
+def normalize_cv_markdown(text):
+    """
+    Cleans a generated CV in one pass over its lines.
+
+    - Lines holding only a placeholder such as "[Your Name]" are dropped.
+    - Bold section titles such as "**EXPERIENCE**" become "## EXPERIENCE" headers;
+      entry titles such as "**IBM | 2020 - 2023**" are left bold.
+    - Bullets written with "•" (and similar) become Markdown list items, preceded
+      by a blank line so that Markdown recognizes the list.
+
+    Args:
+        text (str): The model response.
+
+    Returns:
+        str: Normalized Markdown.
+    """
+    output = []
+    previous = ""  # Kind of the last emitted line: "" (blank or header), "text" or "bullet"
+
+    for line in text.split('\n'):
+        stripped = line.strip()
+
+        if not stripped:
+            output.append("")
+            previous = ""
+            continue
+
+        if PLACEHOLDER_RE.match(stripped):
+            continue
+
+        header = BOLD_HEADER_RE.match(stripped)
+        if header and is_section_header(header.group(1)):
+            if previous:
+                output.append("")
+            output.append(f"## {header.group(1).strip()}")
+            output.append("")
+            previous = ""
+            continue
+
+        if stripped.startswith(BULLET_CHARS):
+            if previous == "text":
+                output.append("")
+            output.append(f"- {stripped[1:].strip()}")
+            previous = "bullet"
+            continue
+
+        output.append(line)
+        previous = "text"
+
+    return '\n'.join(output).strip()
+
+
+# =============================================================================
+# FUNCTION: inject_contact_icons
+# =============================================================================
+def inject_contact_icons(html):
+    """
+    Adds Font Awesome icons in front of the emphasized "Email" and "Phone" labels.
+
+    Args:
+        html (str): HTML produced from the CV Markdown.
+
+    Returns:
+        str: The HTML with the icons.
+    """
+    def add_icon(match):
+        icon = CONTACT_ICONS[match.group(1).lower()]
+        return (f'<em><i class="fas {icon}" style="color:#0d47a1; margin-right:6px;"></i> '
+                f'{match.group(1)}</em>')
+
+    return CONTACT_RE.sub(add_icon, html)
+
+
+# =============================================================================
+# FUNCTION: cv_markdown_to_html
+# =============================================================================
+def cv_markdown_to_html(text):
+    """
+    Turns a generated CV into the HTML inserted in the CV template.
+
+    Args:
+        text (str): The model response in Markdown format.
+
+    Returns:
+        str: The CV body as HTML.
+    """
+    return inject_contact_icons(markdown_to_html(normalize_cv_markdown(text)))
+
+
+# =============================================================================
+# FUNCTION: clean_cover_letter
+# =============================================================================
+def clean_cover_letter(text, candidate_name=None):
+    """
+    Keeps only the body of a generated cover letter, in one pass over its lines.
+
+    Everything before the greeting ("Dear ..." or "To the attention ...") is dropped,
+    as are lines holding only a placeholder. "[Your Name]" is replaced by the
+    candidate's name when it is known.
+
+    Args:
+        text (str): The model response.
+        candidate_name (str | None): The candidate's name.
+
+    Returns:
+        str: The cleaned letter body.
+    """
+    output = []
+    in_body = False
+
+    for line in text.strip().split('\n'):
+        stripped = line.strip()
+        if not in_body and stripped.lower().startswith(("dear", "to the attention")):
+            in_body = True
+        if not in_body or PLACEHOLDER_RE.match(stripped):
+            continue
+        if not stripped and not output:
+            continue
+        if candidate_name:
+            line = line.replace("[Your Name]", candidate_name)
+        output.append(line)
+
+    return '\n'.join(output).strip()
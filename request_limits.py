@@ -0,0 +1,102 @@
+import os
+import time
+import functools
+
+# =============================================================================
+# REQUEST LIMITS
+# =============================================================================
+# Pasted texts are capped before any prompt is built, so a multi-megabyte paste is
+# rejected at the edge instead of being copied into several prompts and failing at
+# the model anyway.
+
+# Maximum characters accepted in a single text field
+MAX_INPUT_CHARS = int(os.getenv('MAX_INPUT_CHARS', '20000'))
+
+# Maximum characters collected over a whole CV Assistant conversation
+MAX_CONVERSATION_CHARS = int(os.getenv('MAX_CONVERSATION_CHARS', '40000'))
+
+
+# =============================================================================
+# FUNCTION: check_input_size
+# =============================================================================
+def check_input_size(*texts, limit=MAX_INPUT_CHARS):
+    """
+    Checks that none of the given texts exceeds the size limit.
+
+    Args:
+        *texts (str | None): Texts to check.
+        limit (int): Maximum number of characters allowed per text.
+
+    Returns:
+        str | None: An error message for the user, or None if every text is within the limit.
+    """
+    for text in texts:
+        if text and len(text) > limit:
+            return (f"Error: The text is too long ({len(text):,} characters). "
+                    f"Please shorten it to at most {limit:,} characters.")
+    return None
+
+
+# =============================================================================
+# FUNCTION: iter_lines
+# =============================================================================
+def iter_lines(text, max_lines=None, sep='\n'):
+    """
+    Yields the lines of a text one at a time without splitting the whole text.
+
+    Args:
+        text (str): The text to read.
+        max_lines (int | None): Stop after this many lines.
+        sep (str): Line separator.
+
+    Yields:
+        str: Each line, without its line break.
+    """
+    start, count = 0, 0
+    while start <= len(text) and (max_lines is None or count < max_lines):
+        end = text.find(sep, start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + len(sep)
+        count += 1
+
+
+# =============================================================================
+# HELPER FUNCTION: current_rss_mb
+# =============================================================================
+def current_rss_mb():
+    """
+    Returns the resident memory of the current process in MB, or None if it cannot be read.
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+# =============================================================================
+# DECORATOR: report_memory
+# =============================================================================
+def report_memory(func):
+    """
+    Logs the duration and the resident memory growth of each call to a request handler.
+
+    The RSS is process-wide, so concurrent requests share the reported growth; a
+    large positive delta still points at the request that ballooned the worker.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        rss_before = current_rss_mb()
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            rss_after = current_rss_mb()
+            input_chars = sum(len(arg) for arg in args if isinstance(arg, str))
+            if rss_before is not None and rss_after is not None:
+                print(f"[memory] {func.__name__}: {input_chars:,} input chars, "
+                      f"{time.perf_counter() - start:.2f}s, RSS {rss_after:.1f} MB ({rss_after - rss_before:+.1f} MB)")
+    return wrapper
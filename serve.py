@@ -0,0 +1,353 @@
+import os
+import re
+import sys
+import signal
+import asyncio
+import argparse
+import hashlib
+import subprocess
+
+# =============================================================================
+# PRODUCTION LAUNCHER
+# =============================================================================
+# Runs several app.py workers (one Python process each) behind a single public
+# port. A small HTTP proxy routes every request to a worker chosen from its Gradio
+# session id, so the queue events and the gr.State of a session always stay on the
+# same process while different sessions are spread over all the workers, even when
+# they come from the same IP address. Requests without a session id (page, assets,
+# uploads) are routed by client address, honoring X-Forwarded-For. Set
+# RESPONSE_CACHE_DB to let the workers share a response cache.
+#
+# Usage:
+#     python serve.py --workers 4 --port 7860
+#
+# Send SIGHUP to the launcher to restart the workers one at a time. A worker stops
+# receiving new clients, and is only stopped once its open connections are closed
+# (or after --grace-period seconds). Clients of a restarted worker lose their gr.State.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Gradio session id in the query of /queue/data, the path of /heartbeat/ and the body of /queue/join
+SESSION_QUERY_RE = re.compile(rb'[?&]session_hash=([\w-]+)')
+SESSION_PATH_RE = re.compile(rb'/heartbeat/([\w-]+)')
+SESSION_BODY_RE = re.compile(rb'"session_hash"\s*:\s*"([\w-]+)"')
+
+# Largest /queue/join body read to find the session id
+MAX_JOIN_BODY = 1024 * 1024
+
+# Hop-by-hop headers replaced by the proxy
+HOP_HEADERS = (b"connection", b"keep-alive", b"proxy-connection")
+
+
+# =============================================================================
+# CLASS: Worker
+# =============================================================================
+class Worker:
+    """
+    A single app.py process listening on a private port.
+    """
+
+    def __init__(self, port, env):
+        self.port = port
+        self.env = env
+        self.process = None
+        self.available = False
+        # Client connections currently proxied to this worker
+        self.active_connections = 0
+
+    def start(self):
+        """
+        Starts the worker process. Gradio reads the port and host from the environment.
+        """
+        env = dict(self.env, GRADIO_SERVER_PORT=str(self.port), GRADIO_SERVER_NAME="127.0.0.1")
+        self.process = subprocess.Popen([sys.executable, "app.py"], cwd=BASE_DIR, env=env)
+
+    async def wait_ready(self, timeout):
+        """
+        Waits until the worker accepts connections on its port.
+
+        Returns:
+            bool: Whether the worker became ready before the timeout.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while loop.time() < deadline:
+            if self.process.poll() is not None:
+                return False
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", self.port)
+                writer.close()
+                self.available = True
+                return True
+            except OSError:
+                await asyncio.sleep(0.5)
+        return False
+
+    async def stop(self, grace_period, exit_timeout=10):
+        """
+        Stops routing new clients to the worker, waits for its open connections to
+        finish (up to grace_period seconds), then terminates it.
+        """
+        self.available = False
+        if self.process is None or self.process.poll() is not None:
+            return
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + grace_period
+        while self.active_connections > 0 and loop.time() < deadline:
+            await asyncio.sleep(0.5)
+        if self.active_connections > 0:
+            print(f"Worker on port {self.port} still has {self.active_connections} open connections, stopping it anyway.")
+
+        self.process.terminate()
+        try:
+            await asyncio.wait_for(loop.run_in_executor(None, self.process.wait), exit_timeout)
+        except asyncio.TimeoutError:
+            self.process.kill()
+
+
+# =============================================================================
+# CLASS: Supervisor
+# =============================================================================
+class Supervisor:
+    """
+    Owns the workers and the public proxy.
+    """
+
+    def __init__(self, args):
+        self.args = args
+        self.workers = [Worker(args.base_port + i, dict(os.environ)) for i in range(args.workers)]
+        self.restarting = False
+
+    def pick_worker(self, route_key):
+        """
+        Chooses the worker for a request. The same key always lands on the same
+        worker while it is available; otherwise the next available one is used.
+
+        Args:
+            route_key (bytes): Gradio session id, or client address, of the request.
+
+        Returns:
+            Worker | None: The selected worker, or None if none is available.
+        """
+        start = int(hashlib.md5(route_key).hexdigest(), 16) % len(self.workers)
+        for offset in range(len(self.workers)):
+            worker = self.workers[(start + offset) % len(self.workers)]
+            if worker.available:
+                return worker
+        return None
+
+    async def handle_client(self, client_reader, client_writer):
+        """
+        Forwards one client request to its worker. The request and its response are
+        sent with "Connection: close", so the client opens a new connection for its
+        next request, which is routed on its own.
+        """
+        peer = client_writer.get_extra_info("peername")
+        try:
+            head = await client_reader.readuntil(b"\r\n\r\n")
+            head, body = await prepare_request(head, client_reader)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            client_writer.close()
+            return
+
+        worker = self.pick_worker(route_key(head, body, peer[0] if peer else ""))
+        if worker is None:
+            client_writer.close()
+            return
+
+        try:
+            worker_reader, worker_writer = await asyncio.open_connection("127.0.0.1", worker.port)
+        except OSError:
+            client_writer.close()
+            return
+
+        worker_writer.write(head + body)
+        worker.active_connections += 1
+        # The rest of the request body is streamed while the response is awaited
+        upload = asyncio.ensure_future(pipe(client_reader, worker_writer))
+        try:
+            response_head = await worker_reader.readuntil(b"\r\n\r\n")
+            if b" 101 " not in response_head.split(b"\r\n", 1)[0]:
+                response_head = single_use_head(response_head)
+            client_writer.write(response_head)
+            await pipe(worker_reader, client_writer)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            client_writer.close()
+            worker_writer.close()
+        finally:
+            await upload
+            worker.active_connections -= 1
+
+    async def rolling_restart(self):
+        """
+        Restarts the workers one at a time so the others keep serving traffic.
+        """
+        if self.restarting:
+            return
+        self.restarting = True
+        try:
+            for worker in self.workers:
+                print(f"Restarting worker on port {worker.port}...")
+                await worker.stop(self.args.grace_period)
+                worker.start()
+                if not await worker.wait_ready(self.args.startup_timeout):
+                    print(f"Worker on port {worker.port} did not become ready.")
+        finally:
+            self.restarting = False
+
+    async def monitor(self):
+        """
+        Restarts workers that exit unexpectedly.
+        """
+        while True:
+            await asyncio.sleep(2)
+            if self.restarting:
+                continue
+            for worker in self.workers:
+                if worker.process.poll() is not None:
+                    print(f"Worker on port {worker.port} exited, starting it again...")
+                    worker.available = False
+                    worker.start()
+                    await worker.wait_ready(self.args.startup_timeout)
+
+    async def run(self):
+        """
+        Starts every worker, the proxy and the signal handlers, and serves until stopped.
+        """
+        for worker in self.workers:
+            worker.start()
+        await asyncio.gather(*(worker.wait_ready(self.args.startup_timeout) for worker in self.workers))
+
+        server = await asyncio.start_server(self.handle_client, self.args.host, self.args.port)
+        print(f"Serving {len(self.workers)} workers on http://{self.args.host}:{self.args.port}")
+
+        loop = asyncio.get_running_loop()
+        stop_event = asyncio.Event()
+        loop.add_signal_handler(signal.SIGHUP, lambda: asyncio.ensure_future(self.rolling_restart()))
+        loop.add_signal_handler(signal.SIGTERM, stop_event.set)
+        loop.add_signal_handler(signal.SIGINT, stop_event.set)
+
+        monitor_task = asyncio.ensure_future(self.monitor())
+        async with server:
+            await stop_event.wait()
+
+        monitor_task.cancel()
+        server.close()
+        await asyncio.gather(*(worker.stop(self.args.grace_period) for worker in self.workers))
+
+
+# =============================================================================
+# HELPER FUNCTION: prepare_request
+# =============================================================================
+async def prepare_request(head, reader):
+    """
+    Prepares the head of a request for a single-request worker connection and, for
+    /queue/join, reads the body that holds the session id.
+
+    Args:
+        head (bytes): Request line and headers, ending with a blank line.
+        reader (asyncio.StreamReader): The client stream, positioned after the head.
+
+    Returns:
+        tuple[bytes, bytes]: The head to send to the worker and the body already read.
+    """
+    lines = head[:-4].split(b"\r\n")
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(b":")
+        headers[name.strip().lower()] = value.strip()
+
+    body = b""
+    target = lines[0].split(b" ")[1] if lines[0].count(b" ") >= 2 else b""
+    length = headers.get(b"content-length", b"")
+    if target.split(b"?")[0].endswith(b"/queue/join") and length.isdigit() and int(length) <= MAX_JOIN_BODY:
+        body = await reader.readexactly(int(length))
+
+    # Upgraded connections (websockets) are piped as they are
+    if b"upgrade" in headers:
+        return head, body
+    return single_use_head(head), body
+
+
+# =============================================================================
+# HELPER FUNCTION: single_use_head
+# =============================================================================
+def single_use_head(head):
+    """
+    Replaces the hop-by-hop headers of a request or response head with "Connection: close".
+
+    Args:
+        head (bytes): Start line and headers, ending with a blank line.
+
+    Returns:
+        bytes: The rewritten head.
+    """
+    lines = head[:-4].split(b"\r\n")
+    kept = [line for line in lines[1:] if line.partition(b":")[0].strip().lower() not in HOP_HEADERS]
+    return b"\r\n".join([lines[0], *kept, b"Connection: close", b"", b""])
+
+
+# =============================================================================
+# HELPER FUNCTION: route_key
+# =============================================================================
+def route_key(head, body, client_host):
+    """
+    Returns the key a request is routed by: its Gradio session id when it has one,
+    otherwise the original client address (first X-Forwarded-For entry, or the peer).
+
+    Args:
+        head (bytes): Request line and headers.
+        body (bytes): Request body read so far.
+        client_host (str): IP address of the connected peer.
+
+    Returns:
+        bytes: The routing key.
+    """
+    request_line, _, headers = head.partition(b"\r\n")
+    for regex, data in ((SESSION_QUERY_RE, request_line), (SESSION_PATH_RE, request_line), (SESSION_BODY_RE, body)):
+        match = regex.search(data)
+        if match:
+            return match.group(1)
+
+    for line in headers.split(b"\r\n"):
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"x-forwarded-for" and value.strip():
+            return value.split(b",")[0].strip()
+    return client_host.encode("utf-8")
+
+
+# =============================================================================
+# HELPER FUNCTION: pipe
+# =============================================================================
+async def pipe(reader, writer):
+    """
+    Copies bytes from a stream to another until the connection is closed.
+    """
+    try:
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+
+
+# =============================================================================
+# RUN LAUNCHER
+# =============================================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run several app workers behind one port.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of app workers.")
+    parser.add_argument("--host", default="0.0.0.0", help="Public host to listen on.")
+    parser.add_argument("--port", type=int, default=7860, help="Public port to listen on.")
+    parser.add_argument("--base-port", type=int, default=7870, help="First private port used by the workers.")
+    parser.add_argument("--startup-timeout", type=float, default=120, help="Seconds to wait for a worker to start.")
+    parser.add_argument("--grace-period", type=float, default=30, help="Seconds to wait for a worker's open connections to finish on restart.")
+    args = parser.parse_args()
+
+    asyncio.run(Supervisor(args).run())
@@ -0,0 +1,93 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# =============================================================================
+# STUB MODEL BACKEND
+# =============================================================================
+# Offline stand-in for ModelInference, enabled with MODEL_BACKEND=stub. It waits
+# STUB_MODEL_LATENCY seconds per prompt and returns canned answers shaped like the
+# ones the app expects, so the app can be load tested without WatsonX credentials.
+
+STUB_MODEL_LATENCY = float(os.getenv('STUB_MODEL_LATENCY', '1.0'))
+
+STUB_CV = """**PERSONAL INFORMATION**
+• *Email* jane.doe@example.com
+• *Phone* +34 600 000 000
+
+**EXPERIENCE**
+**Acme Corp | 2019 - 2024**
+• Led the migration of the billing platform to Python microservices.
+• Mentored a team of four junior developers.
+
+**EDUCATION**
+• BSc in Computer Science, University of Madrid, 2018
+
+**SKILLS**
+• Python, SQL, Docker
+• Communication, teamwork
+"""
+
+STUB_COVER_LETTER = """Dear Hiring Team,
+
+I am writing to express my interest in the position. My experience leading backend projects
+and mentoring developers matches the requirements of your team.
+
+Sincerely,
+Jane Doe"""
+
+
+# =============================================================================
+# CLASS: StubModelInference
+# =============================================================================
+class StubModelInference:
+    """
+    Mimics the parts of ModelInference used by the app.
+    """
+
+    def __init__(self, model_id, latency=STUB_MODEL_LATENCY):
+        self.model_id = model_id
+        self.latency = latency
+
+    def generate_text(self, prompt, params=None, concurrency_limit=5):
+        """
+        Returns a canned answer for a prompt, or a list of answers for a list of prompts.
+        """
+        if isinstance(prompt, list):
+            with ThreadPoolExecutor(max_workers=max(1, min(concurrency_limit, len(prompt)))) as executor:
+                return list(executor.map(lambda single: self.generate_text(single, params), prompt))
+
+        time.sleep(self.latency)
+        return stub_answer(prompt)
+
+
+# =============================================================================
+# HELPER FUNCTION: stub_answer
+# =============================================================================
+def stub_answer(prompt):
+    """
+    Picks a canned answer matching the kind of prompt.
+
+    Args:
+        prompt (str): The prompt sent to the model.
+
+    Returns:
+        str: A plausible model answer.
+    """
+    if '"is_complete"' in prompt:
+        return '{"is_complete": true, "is_relevant": true, "total_experience_years": 5, "needs_more_details": false}'
+    if '"title"' in prompt:
+        return '{"title": "Backend Developer", "skills": ["Python", "SQL", "Docker"], "required_experience": "3 years"}'
+    if "extract ONLY the person's full name" in prompt:
+        return "Jane Doe"
+    if "extract ONLY the email address" in prompt:
+        return "jane.doe@example.com"
+    if "extract ONLY the phone number" in prompt:
+        return "+34 600 000 000"
+    if "cover letter" in prompt:
+        return STUB_COVER_LETTER
+    if "summary" in prompt.lower():
+        return "- The role requires Python and SQL.\n- Three years of experience.\n- Remote work is possible."
+    if "Extract and list the key skills" in prompt:
+        return "- Technical skills: Python, SQL\n- Soft skills: Teamwork\n- Education: BSc\n- Required experience: 3 years"
+    return STUB_CV